@@ -1,8 +1,12 @@
 # config_manager.py
 
 import json
+import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
+from pc_controller import is_error
+
+log = logging.getLogger(__name__)
 
 class LEDConfigManager:
     def __init__(self, client):
@@ -19,7 +23,7 @@ class LEDConfigManager:
                 self.config = json.load(f)
             return True
         except Exception as e:
-            print(f"Error loading config: {e}")
+            log.error("Error loading config: %s", e)
             return False
 
     def save_config_to_file(self, filepath):
@@ -31,7 +35,7 @@ class LEDConfigManager:
                 json.dump(self.config, f, indent=4)
             return True
         except Exception as e:
-            print(f"Error saving config: {e}")
+            log.error("Error saving config: %s", e)
             return False
 
     def send_config_to_led(self):
@@ -42,7 +46,7 @@ class LEDConfigManager:
         try:
             # Send the config
             response = self.client.send_command(f"UPDATE_CONFIG:{json.dumps(self.config)}")
-            if "ERROR" in response:
+            if is_error(response):
                 return False, response
 
             # Verify the config was received correctly
@@ -252,10 +256,12 @@ class GroupDialog:
         self.window.destroy()
 
 class ConfigEditorWindow:
-    def __init__(self, parent, config_manager):
+    def __init__(self, parent, config_manager, run_serial=None):
         self.window = tk.Toplevel(parent)
         self.window.title("LED Configuration Editor")
         self.config_manager = config_manager
+        # Optional run_serial(func, callback=..., errback=...) that performs serial calls off the Tk thread
+        self.run_serial = run_serial
         
         # Create the UI
         self.create_widgets()
@@ -529,7 +535,15 @@ class ConfigEditorWindow:
 
     def send_to_led(self):
         """Send config to LED controller."""
-        success, message = self.config_manager.send_config_to_led()
+        if self.run_serial:
+            self.run_serial(self.config_manager.send_config_to_led, callback=self.show_send_result,
+                            errback=lambda error: self.show_send_result((False, f"Error sending config: {error}")))
+        else:
+            self.show_send_result(self.config_manager.send_config_to_led())
+
+    def show_send_result(self, result):
+        """Report the outcome of sending the config."""
+        success, message = result
         if success:
             messagebox.showinfo("Success", message)
         else:
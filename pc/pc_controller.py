@@ -2,6 +2,17 @@ import serial
 import time
 import paramiko
 import json
+import logging
+
+log = logging.getLogger(__name__)
+
+def is_error(response):
+    """Return True if a command response is an error reply ("ERROR:..." or "Error: ...")."""
+    return response[:5].upper() == "ERROR"
+
+def is_ok(response):
+    """Return True if a command response is a success reply ("OK:...")."""
+    return response.startswith("OK")
 
 class LEDClient:
     def __init__(self, port='COM6', baudrate=115200):
@@ -26,7 +37,7 @@ class LEDClient:
                 return self.config
             return None
         except Exception as e:
-            print(f"Error getting config: {e}")
+            log.error("Error getting config: %s", e)
             return None
             
     def connect(self):
@@ -37,18 +48,18 @@ class LEDClient:
                 self.serial.close()
                 time.sleep(1)
             
-            print(f"\nAttempting to connect to {self.port} at {self.baudrate} baud...")
+            log.info("Attempting to connect to %s at %s baud...", self.port, self.baudrate)
             
             # List available ports
             import serial.tools.list_ports
             ports = list(serial.tools.list_ports.comports())
-            print("\nAvailable COM ports:")
+            log.info("Available COM ports:")
             for p in ports:
-                print(f"  {p.device} - {p.description}")
+                log.info("  %s - %s", p.device, p.description)
 
             # Try to connect
             try:
-                print("\nTrying connection settings...")
+                log.info("Trying connection settings...")
                 self.serial = serial.Serial(
                     port=self.port,
                     baudrate=self.baudrate,
@@ -64,7 +75,7 @@ class LEDClient:
                 )
                 
                 if self.serial.is_open:
-                    print("Port opened successfully!")
+                    log.info("Port opened successfully!")
                     time.sleep(0.5)
                     
                     # Clear any pending data
@@ -74,35 +85,35 @@ class LEDClient:
                     # Test the connection and get mode
                     connected, mode = self.test_connection()
                     if connected:
-                        print(f"Connected successfully in {mode} mode!")
+                        log.info("Connected successfully in %s mode!", mode)
                         self.connected = True
                         self.last_mode = mode  # Make sure mode is stored here too
                         
                         # If in LED mode, get the configuration
                         if mode == "LED":
                             if self.get_config():
-                                print("Configuration received successfully!")
-                                print(f"Found {len(self.config['strips'])} LED strips:")
+                                log.info("Configuration received successfully!")
+                                log.info("Found %s LED strips:", len(self.config['strips']))
                                 for strip in self.config['strips']:
-                                    print(f"  {strip['name']}: {strip['count']} LEDs")
+                                    log.info("  %s: %s LEDs", strip['name'], strip['count'])
                             else:
-                                print("Warning: Failed to get LED configuration")
+                                log.warning("Failed to get LED configuration")
                                 return False
                         return True
                     
-                    print("Connection test failed")
+                    log.error("Connection test failed")
                     if self.serial and self.serial.is_open:
                         self.serial.close()
                     return False
                     
             except Exception as e:
-                print(f"Connection attempt failed: {e}")
+                log.error("Connection attempt failed: %s", e)
                 if self.serial and self.serial.is_open:
                     self.serial.close()
                 return False
             
         except Exception as e:
-            print(f"Connection failed: {e}")
+            log.error("Connection failed: %s", e)
             self.connected = False
             if self.serial and self.serial.is_open:
                 self.serial.close()
@@ -117,9 +128,9 @@ class LEDClient:
                 self.send_command("EXIT")
                 time.sleep(0.1)
                 self.serial.close()
-                print("Disconnected successfully!")
+                log.info("Disconnected successfully!")
             except:
-                print("Error during disconnect!")
+                log.error("Error during disconnect!")
         self.connected = False
         self.active_effects.clear()
 
@@ -166,9 +177,9 @@ class LEDClient:
             self.serial.reset_output_buffer()
             
             # Send test command and wait for response
-            print("Sending test command...")
+            log.debug("Sending test command...")
             command_bytes = "whoami\n".encode('utf-8')
-            print(f"Raw bytes being sent: {command_bytes!r}")
+            log.debug("Raw bytes being sent: %r", command_bytes)
             self.serial.write(command_bytes)
             self.serial.flush()
             
@@ -184,7 +195,7 @@ class LEDClient:
                 time.sleep(0.1)  # Add small delay to prevent busy waiting
             
             response = response.strip()
-            print(f"Raw response: {response!r}")  # Print raw response for debugging
+            log.debug("Raw response: %r", response)
             
             # Check for LED mode
             if response == "LED":
@@ -200,7 +211,7 @@ class LEDClient:
                     terminal_response += char
                 time.sleep(0.1)
             
-            print(f"Additional response: {terminal_response!r}")  # Debug print
+            log.debug("Additional response: %r", terminal_response)
             
             # Check for terminal mode indicators
             if "dan" in terminal_response or "root" in terminal_response:
@@ -217,7 +228,7 @@ class LEDClient:
             return False, "Not Responding"
             
         except Exception as e:
-            print(f"Connection test error: {e}")
+            log.error("Connection test error: %s", e)
             self.last_mode = "Error"
             return False, "Error"
 
@@ -236,7 +247,7 @@ class LEDClient:
                     return self.test_led_mode()
             return False
         except Exception as e:
-            print(f"Start LED service error: {e}")
+            log.error("Start LED service error: %s", e)
             return False
 
     def stop_led_service(self):
@@ -254,7 +265,7 @@ class LEDClient:
                     return not self.test_led_mode()
             return False
         except Exception as e:
-            print(f"Stop LED service error: {e}")
+            log.error("Stop LED service error: %s", e)
             return False
 
     def send_command(self, command):
@@ -287,39 +298,67 @@ class LEDClient:
                     return "Error: Invalid brightness format. Use BRIGHTNESS:strip_id:value"
             
         try:
-            print(f"Sending command: {command}")
+            log.debug("Sending command: %s", command)
             # First clear any pending input
             self.serial.reset_input_buffer()
             # Send command with clear delimiter
             command_bytes = f"{command}\n".encode('utf-8')
-            print(f"Raw bytes being sent: {command_bytes!r}")
+            log.debug("Raw bytes being sent: %r", command_bytes)
             self.serial.write(command_bytes)
             self.serial.flush()  # Ensure all data is sent
             
-            print("Waiting for response...")
-            response = ''
-            while True:
-                if self.serial.in_waiting:
-                    char = self.serial.read().decode('utf-8', errors='ignore')
-                    if char == '\n' or char == '':
-                        break
-                    response += char
-            
-            response = response.strip()
-            print(f"Raw response received: {response!r}")
+            log.debug("Waiting for response...")
+            response = self._read_response()
+            log.debug("Raw response received: %r", response)
             return response
         except Exception as e:
             return f"Error: {str(e)}"
+
+    def send_commands(self, commands):
+        """Send several commands in a single write and return their responses in order.
+        
+        The server handles newline-delimited commands one at a time, so pipelining
+        them costs one write instead of one round-trip per command.
+        """
+        if not self.serial or not self.serial.is_open:
+            return ["Error: Not connected"] * len(commands)
+            
+        try:
+            log.debug("Sending commands: %s", commands)
+            self.serial.reset_input_buffer()
+            self.serial.write(''.join(f"{command}\n" for command in commands).encode('utf-8'))
+            self.serial.flush()
+            
+            responses = [self._read_response() for _ in commands]
+            log.debug("Raw responses received: %r", responses)
+            return responses
+        except Exception as e:
+            return [f"Error: {str(e)}"] * len(commands)
+
+    def _read_response(self):
+        """Read a single newline-terminated response line.
+        
+        read_until blocks in the kernel until data arrives instead of spinning on
+        in_waiting; it is retried while bytes keep coming so long replies such as
+        CONFIG are not cut off, and gives up once the port timeout passes in silence.
+        """
+        response = b''
+        while True:
+            chunk = self.serial.read_until(b'\n')
+            response += chunk
+            if not chunk or chunk.endswith(b'\n'):
+                break
+        return response.decode('utf-8', errors='ignore').strip()
             
     def release_serial(self):
         """Release serial control by sending escape sequence."""
         if self.serial and self.serial.is_open:
-            print("Sending escape sequence...")
+            log.debug("Sending escape sequence...")
             for _ in range(3):
                 self.serial.write(b'\x1b')
                 time.sleep(0.1)
             self.serial.close()
-            print("Serial control released!")
+            log.info("Serial control released!")
 
     def start_server(self):
         """Start the LED server on the Raspberry Pi via SSH."""
@@ -338,7 +377,7 @@ class LEDClient:
             return True
             
         except Exception as e:
-            print(f"SSH Error: {e}")
+            log.error("SSH Error: %s", e)
             if self.ssh:
                 self.ssh.close()
             return False
@@ -396,18 +435,18 @@ class LEDClient:
             responses = []
             for strip_id in list(self.active_effects.keys()):
                 response = self.send_command(f"STOP_EFFECT:{strip_id}")
-                if 'OK' in response:
+                if is_ok(response):
                     del self.active_effects[strip_id]
                 responses.append(response)
             # Return success if any strip succeeded
-            if any('OK' in resp for resp in responses):
+            if any(is_ok(resp) for resp in responses):
                 return "OK:EFFECTS_STOPPED"
             else:
                 return responses[0]  # Return first error if all failed
         else:
             # Stop effect on specific strip
             response = self.send_command(f"STOP_EFFECT:{strip_id}")
-            if 'OK' in response and str(strip_id) in self.active_effects:
+            if is_ok(response) and str(strip_id) in self.active_effects:
                 del self.active_effects[str(strip_id)]
             return response
 
@@ -427,14 +466,14 @@ class LEDClient:
                 responses = []
                 for strip in self.config['strips']:
                     response = self.send_command(f"RAINBOW_WAVE:{strip['id']}:{wait_ms}")
-                    if 'OK' in response:
+                    if is_ok(response):
                         self.active_effects[str(strip['id'])] = {
                             'type': 'RAINBOW_WAVE',
                             'params': {'wait_ms': wait_ms}
                         }
                     responses.append(response)
                 # Return success if any strip succeeded
-                if any('OK' in resp for resp in responses):
+                if any(is_ok(resp) for resp in responses):
                     return "OK:RAINBOW_WAVE_STARTED"
                 else:
                     return responses[0]  # Return first error if all failed
@@ -442,7 +481,7 @@ class LEDClient:
                 if not any(str(s['id']) == str(strip_id) for s in self.config['strips']):
                     return "ERROR: Invalid strip ID"
                 response = self.send_command(f"RAINBOW_WAVE:{strip_id}:{wait_ms}")
-                if 'OK' in response:
+                if is_ok(response):
                     self.active_effects[str(strip_id)] = {
                         'type': 'RAINBOW_WAVE',
                         'params': {'wait_ms': wait_ms}
@@ -456,7 +495,7 @@ class LEDClient:
         if not any(str(s['id']) == str(strip_id) for s in self.config['strips']):
             return "ERROR: Invalid strip ID"
         response = self.send_command(f"GROUP_RAINBOW_WAVE:{strip_id}:{grouping_id}:{wait_ms}")
-        if 'OK' in response:
+        if is_ok(response):
             self.active_effects[str(strip_id)] = {
                 'type': 'GROUP_RAINBOW_WAVE',
                 'params': {
@@ -471,7 +510,7 @@ class LEDClient:
         if not any(str(s['id']) == str(strip_id) for s in self.config['strips']):
             return "ERROR: Invalid strip ID"
         response = self.send_command(f"INDIVIDUAL_GROUP_RAINBOW_WAVE:{strip_id}:{grouping_id}:{group_id}:{wait_ms}")
-        if 'OK' in response:
+        if is_ok(response):
             self.active_effects[str(strip_id)] = {
                 'type': 'INDIVIDUAL_GROUP_RAINBOW_WAVE',
                 'params': {
@@ -483,6 +522,7 @@ class LEDClient:
         return response
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     client = LEDClient()
     
     try:
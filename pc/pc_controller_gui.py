@@ -1,16 +1,46 @@
 import tkinter as tk
 from tkinter import ttk
-import serial.tools.list_ports
-from pc_controller import LEDClient
+from pc_controller import LEDClient, is_error, is_ok
+import queue
 import time
-from tkinter import colorchooser
+import threading
+import logging
+import logging.handlers
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, auto
+
+log = logging.getLogger(__name__)
+
+# Maximum number of lines kept in the optional log pane
+LOG_PANE_LINES = 500
+# How long an enumerated port list is reused before the ports are scanned again
+PORT_CACHE_SECONDS = 2
+
+class UiState(Enum):
+    """Connection-level states of the main window's controls."""
+    DISCONNECTED = auto()
+    CONNECTING = auto()
+    CONNECTED_TERMINAL = auto()
+    CONNECTED_LED = auto()
+    SWITCHING = auto()
 
 class LEDGUI:
-    def __init__(self, root):
+    def __init__(self, root, show_log=False):
         self.root = root
         self.root.title("LED Controller")
+        # Keep the window hidden while widgets are created so it is mapped once, fully laid out
+        self.root.withdraw()
         self.client = LEDClient()
         self.connected = False
+        # Bumped whenever a mode switch starts or is abandoned, so stale steps of it do nothing
+        self._mode_switch_gen = 0
+        
+        # All serial I/O runs on a single worker thread so commands never overlap;
+        # results are handed back to Tk through a queue drained by _pump_results
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._results = queue.SimpleQueue()
+        self.root.after(10, self._pump_results)
         
         # Create main frame
         self.main_frame = ttk.Frame(root, padding="10")
@@ -36,8 +66,12 @@ class LEDGUI:
         
         # COM Port dropdown
         self.port_var = tk.StringVar()
-        self.port_dropdown = ttk.Combobox(self.control_frame, textvariable=self.port_var)
+        self.port_dropdown = ttk.Combobox(self.control_frame, textvariable=self.port_var,
+                                          postcommand=self.refresh_ports)
         self.port_dropdown.grid(row=0, column=0, padx=5)
+        # Ports are enumerated off the Tk thread; the result is reused for a couple of seconds
+        self._ports_checked = None
+        self._ports_scanning = False
         self.refresh_ports()
         
         # Connect/Disconnect button
@@ -60,6 +94,104 @@ class LEDGUI:
                                     command=self.open_config_editor, state='disabled')
         self.config_btn.grid(row=0, column=4, padx=5)
         
+        if show_log:
+            self._build_log_pane()
+        
+        # Strip/grouping state used by the LED controls, which are only built
+        # once a connection in LED mode is established
+        self.strip_name_to_id = {'All Strips': 'ALL'}
+        self._strip_id_to_name = {}
+        # Per-strip lookup of groupings by name and groups by ID, rebuilt when config changes
+        self._grouping_index = {}
+        # Strip ID and (strip ID, group ID, group) resolved once per selection for the send paths
+        self._current_strip_id = 'ALL'
+        self._current_group = None
+        # Pending after() handle for the throttled brightness send, and the value it will send
+        self._bright_after = None
+        self._bright_latest = None
+        # Latest queued color/brightness command per target, sent together on the next idle
+        self._pending = {}
+        self._flush_scheduled = False
+        # Last values pushed to each dropdown, so unchanged lists skip the Tcl reassignment
+        self._dropdown_values = {}
+        # (strip ID, grouping name) the group dropdown currently lists, so it isn't rebuilt for the same one
+        self._group_dropdown_for = None
+        # Pending after() handles for the debounced combobox selection handlers
+        self._strip_select_after = None
+        self._grouping_select_after = None
+        
+        self._build_ui_scripts()
+        
+        self.root.deiconify()
+
+    def _build_log_pane(self):
+        """Show log records in a bounded text pane, fed through a queue so logging never touches Tk directly."""
+        log_frame = ttk.LabelFrame(self.main_frame, text="Log", padding="5")
+        log_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        self.log_text = tk.Text(log_frame, height=8, width=80, state='disabled')
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.log_text['yscrollcommand'] = scrollbar.set
+        
+        self._log_records = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(self._log_records)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        logging.getLogger().addHandler(handler)
+        self.root.after(100, self._pump_log)
+
+    def _pump_log(self):
+        """Append queued log records to the log pane, dropping the oldest lines past the limit."""
+        try:
+            lines = []
+            while True:
+                try:
+                    lines.append(self._log_records.get_nowait().getMessage())
+                except queue.Empty:
+                    break
+            if lines:
+                self.log_text['state'] = 'normal'
+                self.log_text.insert('end', '\n'.join(lines) + '\n')
+                self.log_text.delete('1.0', f'end-{LOG_PANE_LINES + 1}l')
+                self.log_text['state'] = 'disabled'
+                self.log_text.see('end')
+        finally:
+            self.root.after(100, self._pump_log)
+
+    def _build_led_controls(self):
+        """Create the LED, group and effect frames on the first switch into LED mode."""
+        if hasattr(self, 'led_frame'):
+            return
+        # Validator shared by all R/G/B spinboxes
+        self._byte_vcmd = (self.root.register(self._valid_byte), '%P')
+        self._build_led_frame()
+        self._build_group_frame()
+        self._build_effects_frame()
+        
+        # Precomputed Tcl scripts that toggle all LED controls in one call
+        led_dropdowns = (self.strip_dropdown, self.strip_effect_dropdown,
+                         self.group_set_effect_dropdown, self.group_effect_dropdown)
+        led_widgets = (self.color_btn, self.brightness_btn, self.test_pattern_btn,
+                       self.off_btn, self.brightness_scale, self.r_entry,
+                       self.g_entry, self.b_entry, self.choose_color_btn,
+                       self.animation_speed_entry, self.start_strip_effect_btn,
+                       self.start_group_set_effect_btn, self.start_group_effect_btn,
+                       self.stop_all_effects_btn)
+        self._enable_led_script = self._state_script(normal=led_widgets, readonly=led_dropdowns)
+        self._disable_led_script = self._state_script(disabled=led_dropdowns + led_widgets)
+        # Entering or leaving LED mode toggles both sets, so keep those as one script too
+        self._enable_all_script = self._enable_led_script + '\n' + self._enable_group_script
+        self._disable_all_script = self._disable_led_script + '\n' + self._disable_group_script
+        # Picking "All Strips" or a single strip toggles the group controls and group effect buttons together
+        group_effect_btns = (self.start_group_set_effect_btn, self.start_group_effect_btn)
+        self._all_strips_script = (self._disable_group_script + '\n' +
+                                   self._state_script(disabled=group_effect_btns))
+        self._single_strip_script = (self._enable_group_script + '\n' +
+                                     self._state_script(normal=group_effect_btns))
+        self._build_ui_scripts()
+
+    def _build_led_frame(self):
+        """Create the strip color and brightness controls."""
         # LED Control Frame
         self.led_frame = ttk.LabelFrame(self.main_frame, text="LED Controls", padding="5")
         self.led_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
@@ -67,29 +199,32 @@ class LEDGUI:
         # Strip selection
         ttk.Label(self.led_frame, text="Strip:").grid(row=0, column=0, padx=2)
         self.strip_var = tk.StringVar(value="All Strips")
-        self.strip_name_to_id = {'All Strips': 'ALL'}
         self.strip_dropdown = ttk.Combobox(self.led_frame, textvariable=self.strip_var, 
                                          state='readonly', width=10)
         self.strip_dropdown['values'] = ['All Strips']
         self.strip_dropdown.grid(row=0, column=1, columnspan=2, padx=2)
         self.strip_dropdown.bind('<<ComboboxSelected>>', self.on_strip_selected)
         
-        # RGB controls
-        self.r_var = tk.StringVar(value="0")
-        self.g_var = tk.StringVar(value="0")
-        self.b_var = tk.StringVar(value="0")
+        # RGB controls, restricted to 0-255 as the user types
+        self.r_var = tk.IntVar(value=0)
+        self.g_var = tk.IntVar(value=0)
+        self.b_var = tk.IntVar(value=0)
+        vcmd = self._byte_vcmd
         
-        # RGB entries
+        # RGB spinboxes
         ttk.Label(self.led_frame, text="R:").grid(row=1, column=0, padx=2)
-        self.r_entry = ttk.Entry(self.led_frame, width=5, textvariable=self.r_var)
+        self.r_entry = ttk.Spinbox(self.led_frame, from_=0, to=255, increment=1, width=5,
+                                     textvariable=self.r_var, validate='key', validatecommand=vcmd)
         self.r_entry.grid(row=1, column=1, padx=2)
         
         ttk.Label(self.led_frame, text="G:").grid(row=1, column=2, padx=2)
-        self.g_entry = ttk.Entry(self.led_frame, width=5, textvariable=self.g_var)
+        self.g_entry = ttk.Spinbox(self.led_frame, from_=0, to=255, increment=1, width=5,
+                                     textvariable=self.g_var, validate='key', validatecommand=vcmd)
         self.g_entry.grid(row=1, column=3, padx=2)
         
         ttk.Label(self.led_frame, text="B:").grid(row=1, column=4, padx=2)
-        self.b_entry = ttk.Entry(self.led_frame, width=5, textvariable=self.b_var)
+        self.b_entry = ttk.Spinbox(self.led_frame, from_=0, to=255, increment=1, width=5,
+                                     textvariable=self.b_var, validate='key', validatecommand=vcmd)
         self.b_entry.grid(row=1, column=5, padx=2)
         
         # Choose Color button
@@ -106,8 +241,10 @@ class LEDGUI:
         ttk.Label(self.led_frame, text="Brightness:").grid(row=2, column=0, pady=5)
         self.brightness_var = tk.IntVar(value=128)
         self.brightness_scale = ttk.Scale(self.led_frame, from_=0, to=255, 
-                                        orient=tk.HORIZONTAL, variable=self.brightness_var)
+                                        orient=tk.HORIZONTAL, variable=self.brightness_var,
+                                        command=self._on_brightness_change)
         self.brightness_scale.grid(row=2, column=1, columnspan=5, sticky=(tk.W, tk.E), pady=5, padx=2)
+        # The slider sends live; the button just re-sends the current value
         self.brightness_btn = ttk.Button(self.led_frame, text="Set Brightness", 
                                        command=self.set_brightness, state='disabled')
         self.brightness_btn.grid(row=2, column=6, pady=5, padx=5)
@@ -120,7 +257,9 @@ class LEDGUI:
         self.off_btn = ttk.Button(self.led_frame, text="Turn Off", 
                                  command=self.turn_off, state='disabled')
         self.off_btn.grid(row=3, column=3, columnspan=4, padx=5, pady=5, sticky=tk.E)
-        
+
+    def _build_group_frame(self):
+        """Create the group color controls."""
         # Group Control Frame
         self.group_frame = ttk.LabelFrame(self.main_frame, text="Group Controls", padding="5")
         self.group_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
@@ -139,22 +278,30 @@ class LEDGUI:
         self.group_dropdown = ttk.Combobox(self.group_frame, textvariable=self.group_var, 
                                          state='readonly', width=15)
         self.group_dropdown.grid(row=0, column=4, columnspan=2, padx=2)
+        self.group_dropdown.bind('<<ComboboxSelected>>', self._on_group_selected)
         
         # RGB controls for group
-        self.group_r_var = tk.StringVar(value="0")
-        self.group_g_var = tk.StringVar(value="0")
-        self.group_b_var = tk.StringVar(value="0")
+        self.group_r_var = tk.IntVar(value=0)
+        self.group_g_var = tk.IntVar(value=0)
+        self.group_b_var = tk.IntVar(value=0)
+        vcmd = self._byte_vcmd
         
         ttk.Label(self.group_frame, text="R:").grid(row=1, column=0, padx=2, pady=5)
-        self.group_r_entry = ttk.Entry(self.group_frame, width=5, textvariable=self.group_r_var)
+        self.group_r_entry = ttk.Spinbox(self.group_frame, from_=0, to=255, increment=1, width=5,
+                                           textvariable=self.group_r_var, validate='key',
+                                           validatecommand=vcmd)
         self.group_r_entry.grid(row=1, column=1, padx=2, pady=5)
         
         ttk.Label(self.group_frame, text="G:").grid(row=1, column=2, padx=2, pady=5)
-        self.group_g_entry = ttk.Entry(self.group_frame, width=5, textvariable=self.group_g_var)
+        self.group_g_entry = ttk.Spinbox(self.group_frame, from_=0, to=255, increment=1, width=5,
+                                           textvariable=self.group_g_var, validate='key',
+                                           validatecommand=vcmd)
         self.group_g_entry.grid(row=1, column=3, padx=2, pady=5)
         
         ttk.Label(self.group_frame, text="B:").grid(row=1, column=4, padx=2, pady=5)
-        self.group_b_entry = ttk.Entry(self.group_frame, width=5, textvariable=self.group_b_var)
+        self.group_b_entry = ttk.Spinbox(self.group_frame, from_=0, to=255, increment=1, width=5,
+                                           textvariable=self.group_b_var, validate='key',
+                                           validatecommand=vcmd)
         self.group_b_entry.grid(row=1, column=5, padx=2, pady=5)
         
         # Group color button
@@ -162,17 +309,28 @@ class LEDGUI:
                                         command=self.set_group_color, state='disabled')
         self.group_color_btn.grid(row=1, column=6, padx=5, pady=5)
         
+        # Precomputed Tcl scripts that toggle all group controls in one call
+        group_dropdowns = (self.grouping_dropdown, self.group_dropdown)
+        group_widgets = (self.group_r_entry, self.group_g_entry, self.group_b_entry,
+                         self.group_color_btn)
+        self._enable_group_script = self._state_script(normal=group_widgets, readonly=group_dropdowns)
+        self._disable_group_script = self._state_script(disabled=group_dropdowns + group_widgets)
+        
         # Disable group controls initially
         self.disable_group_controls()
-        
+
+    def _build_effects_frame(self):
+        """Create the effect controls."""
         # Effects Frame
         self.effects_frame = ttk.LabelFrame(self.main_frame, text="Effects", padding="5")
         self.effects_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
         # Animation speed control
         ttk.Label(self.effects_frame, text="Animation Speed (ms):").grid(row=0, column=0, padx=2)
-        self.animation_speed_var = tk.StringVar(value="20")
-        self.animation_speed_entry = ttk.Entry(self.effects_frame, width=5, textvariable=self.animation_speed_var)
+        self.animation_speed_var = tk.IntVar(value=20)
+        self.animation_speed_entry = ttk.Entry(self.effects_frame, width=5, textvariable=self.animation_speed_var,
+                                               validate='key',
+                                               validatecommand=(self.root.register(self._valid_digits), '%P'))
         self.animation_speed_entry.grid(row=0, column=1, padx=2)
         
         # Active Effects Frame
@@ -180,7 +338,11 @@ class LEDGUI:
         self.active_effects_frame.grid(row=0, column=2, rowspan=5, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
         
         # Active effects listbox
-        self.active_effects_listbox = tk.Listbox(self.active_effects_frame, height=4, width=40)
+        # The listbox mirrors a Python list through its listvariable, replaced in one assignment
+        self._effects_model = []
+        self._effects_var = tk.StringVar()
+        self.active_effects_listbox = tk.Listbox(self.active_effects_frame, height=4, width=40,
+                                                 listvariable=self._effects_var)
         self.active_effects_listbox.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E))
         
         # Start Strip Effect button (moved)
@@ -205,7 +367,7 @@ class LEDGUI:
         
         # Strip Effects
         ttk.Label(self.effects_frame, text="Strip Effect:").grid(row=1, column=0, padx=2)
-        self.strip_effect_var = tk.StringVar()
+        self.strip_effect_var = tk.StringVar(value='Rainbow Wave')
         self.strip_effect_dropdown = ttk.Combobox(self.effects_frame, textvariable=self.strip_effect_var, 
                                                 state='readonly', width=20)
         self.strip_effect_dropdown['values'] = ['Rainbow Wave']  # Add more effects here
@@ -213,7 +375,7 @@ class LEDGUI:
         
         # Group Set Effects
         ttk.Label(self.effects_frame, text="Group Set Effect:").grid(row=2, column=0, padx=2)
-        self.group_set_effect_var = tk.StringVar()
+        self.group_set_effect_var = tk.StringVar(value='Rainbow Wave')
         self.group_set_effect_dropdown = ttk.Combobox(self.effects_frame, textvariable=self.group_set_effect_var, 
                                                     state='readonly', width=20)
         self.group_set_effect_dropdown['values'] = ['Rainbow Wave']  # Add more effects here
@@ -221,15 +383,108 @@ class LEDGUI:
         
         # Individual Group Effects
         ttk.Label(self.effects_frame, text="Group Effect:").grid(row=3, column=0, padx=2)
-        self.group_effect_var = tk.StringVar()
+        self.group_effect_var = tk.StringVar(value='Rainbow Wave')
         self.group_effect_dropdown = ttk.Combobox(self.effects_frame, textvariable=self.group_effect_var, 
                                                 state='readonly', width=20)
         self.group_effect_dropdown['values'] = ['Rainbow Wave']  # Add more effects here
         self.group_effect_dropdown.grid(row=3, column=1, padx=2)
 
+    @staticmethod
+    def _valid_byte(value):
+        """Entry validator: allow only empty text or an integer from 0-255."""
+        return value == '' or (value.isascii() and value.isdigit() and int(value) <= 255)
+
+    @staticmethod
+    def _valid_digits(value):
+        """Entry validator: allow only empty text or a non-negative integer."""
+        return value == '' or (value.isascii() and value.isdigit())
+
+    @staticmethod
+    def _state_script(normal=(), readonly=(), disabled=()):
+        """Build a single Tcl script that sets the state of several widgets."""
+        commands = []
+        for state, widgets in (('normal', normal), ('readonly', readonly), ('disabled', disabled)):
+            commands.extend(f"{widget} configure -state {state}" for widget in widgets)
+        return '\n'.join(commands)
+
+    def _run_serial(self, func, *args, callback=None, errback=None):
+        """Run a client call on the serial worker, delivering its outcome on the Tk thread.
+        
+        callback(result) gets the return value. If the call raises, errback(exception)
+        gets the exception instead, or it is logged when there is no errback.
+        """
+        def job():
+            try:
+                result = func(*args)
+            except Exception as e:
+                self._results.put((errback or self._log_serial_error, e))
+            else:
+                if callback:
+                    self._results.put((callback, result))
+        return self._executor.submit(job)
+
+    def _log_serial_error(self, error):
+        """Default errback: log a serial call that raised."""
+        log.error("Serial call failed: %s", error)
+
+    def _queue_command(self, key, command, callback):
+        """Queue a command, replacing any pending one for the same target, and schedule a flush."""
+        # Re-inserting moves the key to the end so later commands still win over earlier ones
+        self._pending.pop(key, None)
+        self._pending[key] = (command, callback)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_commands)
+
+    def _flush_commands(self):
+        """Send all queued commands to the LED server in a single serial write."""
+        self._flush_scheduled = False
+        pending = list(self._pending.values())
+        self._pending.clear()
+        
+        def done(responses):
+            for (_, callback), response in zip(pending, responses):
+                callback(response)
+        
+        self._run_serial(self.client.send_commands, [command for command, _ in pending], callback=done)
+
+    def _pump_results(self):
+        """Dispatch finished serial calls to their callbacks or errbacks."""
+        try:
+            while True:
+                callback, result = self._results.get_nowait()
+                callback(result)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(10, self._pump_results)
+
     def refresh_ports(self):
-        """Refresh the list of available COM ports."""
-        ports = [p.device for p in serial.tools.list_ports.comports()]
+        """Refresh the list of available COM ports in the background."""
+        if self._ports_scanning:
+            return
+        if self._ports_checked is not None and time.monotonic() - self._ports_checked < PORT_CACHE_SECONDS:
+            return
+        self._ports_scanning = True
+        threading.Thread(target=self._enumerate_ports, daemon=True).start()
+
+    def _enumerate_ports(self):
+        """Enumerate serial ports (slow on Windows) and hand the result to the Tk thread."""
+        try:
+            # Imported here so the platform port backend loads off the Tk thread
+            import serial.tools.list_ports
+            ports = [p.device for p in serial.tools.list_ports.comports()]
+        except Exception as e:
+            log.error("Error listing serial ports: %s", e)
+            ports = None
+        self._results.put((self._apply_ports, ports))
+
+    def _apply_ports(self, ports):
+        """Show the enumerated ports in the port dropdown."""
+        self._ports_scanning = False
+        if ports is None:
+            return
+        self._ports_checked = time.monotonic()
         self.port_dropdown['values'] = ports
         if ports and not self.port_var.get():
             self.port_var.set(ports[0])
@@ -249,481 +504,555 @@ class LEDGUI:
             else:
                 self.mode_status['foreground'] = "gray"
 
+    def _build_ui_scripts(self):
+        """Precompute one Tcl script per UiState covering every connection-level control.
+        
+        Called again once the LED frames exist so their controls join the scripts.
+        """
+        connected = (self.connect_btn, self.test_conn_btn, self.mode_btn, self.config_btn)
+        layouts = {
+            UiState.DISCONNECTED: dict(normal=(self.connect_btn, self.port_dropdown),
+                                       disabled=(self.test_conn_btn, self.mode_btn, self.config_btn)),
+            UiState.CONNECTING: dict(disabled=connected + (self.port_dropdown,)),
+            UiState.CONNECTED_TERMINAL: dict(normal=connected, disabled=(self.port_dropdown,)),
+            UiState.CONNECTED_LED: dict(normal=connected, disabled=(self.port_dropdown,)),
+            UiState.SWITCHING: dict(normal=(self.connect_btn, self.config_btn),
+                                    disabled=(self.test_conn_btn, self.mode_btn, self.port_dropdown)),
+        }
+        has_led = hasattr(self, 'led_frame')
+        self._ui_scripts = {}
+        for state, layout in layouts.items():
+            text = "Connect" if state in (UiState.DISCONNECTED, UiState.CONNECTING) else "Disconnect"
+            script = [self._state_script(**layout), f"{self.connect_btn} configure -text {text}"]
+            if has_led:
+                script.append(self._enable_all_script if state is UiState.CONNECTED_LED
+                              else self._disable_all_script)
+            self._ui_scripts[state] = '\n'.join(script)
+
+    def _set_ui_state(self, state):
+        """Put every connection-level control into the given UiState with one Tcl eval."""
+        if state is UiState.CONNECTED_LED:
+            self._build_led_controls()
+        self.root.tk.eval(self._ui_scripts[state])
+
     def toggle_connection(self):
         """Connect or disconnect from serial port."""
         if not self.connected:
-            try:
-                print("Attempting to connect...")
-                self.client.port = self.port_var.get()
-                if self.client.connect():  # This already includes the test_connection
-                    print("Connection successful!")
-                    self.connected = True
-                    self.connect_btn['text'] = "Disconnect"
-                    self.test_conn_btn['state'] = 'normal'
-                    self.mode_btn['state'] = 'normal'
-                    self.port_dropdown['state'] = 'disabled'
-                    
-                    # Get current mode from client's last test_connection result
-                    self.update_status(connected=True, mode=self.client.last_mode)
-                    
-                    # Enable LED controls if in LED mode
-                    if self.client.last_mode == "LED":
-                        self.update_strip_dropdown()  # Update strip options
-                        self.enable_led_controls()
-                        self.enable_group_controls()  # Enable group controls too
-                        self.update_grouping_dropdown()  # Initialize grouping options
-                    else:
-                        self.disable_led_controls()
-                        self.disable_group_controls()
-                    
-                    # Enable config editor when connected
-                    self.config_btn['state'] = 'normal'
-                    
-                else:
-                    print("Connection failed!")
-                    self.update_status(connected=False, mode="Not Connected")
-                    
-            except Exception as e:
-                print(f"Connection error: {e}")
-                self.connected = False
-                self.update_status(connected=False, mode="Error")
+            log.info("Attempting to connect...")
+            self.client.port = self.port_var.get()
+            # Ignore further clicks until the worker has finished connecting
+            self._set_ui_state(UiState.CONNECTING)
+            self.update_status(mode="Connecting...")
+            # connect() already includes the test_connection
+            self._run_serial(self.client.connect, callback=self._finish_connect, errback=self._connect_failed)
         else:
-            self.client.disconnect()
+            # Abandon any mode switch still in progress
+            self._mode_switch_gen += 1
+            self._run_serial(self.client.disconnect)
             self.connected = False
-            self.connect_btn['text'] = "Connect"
-            self.test_conn_btn['state'] = 'disabled'
-            self.mode_btn['state'] = 'disabled'
-            self.port_dropdown['state'] = 'normal'
             self.update_status(connected=False, mode="Unknown")
-            self.disable_led_controls()
-            self.disable_group_controls()
-            self.config_btn['state'] = 'disabled'
+            self._set_ui_state(UiState.DISCONNECTED)
+
+    def _finish_connect(self, result):
+        """Update the UI once the serial worker has finished connecting."""
+        if result is True:
+            log.info("Connection successful!")
+            self.connected = True
+            
+            # Get current mode from client's last test_connection result
+            self.update_status(connected=True, mode=self.client.last_mode)
+            
+            # Enable LED controls if in LED mode
+            if self.client.last_mode == "LED":
+                self._enter_led_mode()
+            else:
+                self._set_ui_state(UiState.CONNECTED_TERMINAL)
+        else:
+            log.error("Connection failed!")
+            self.update_status(connected=False, mode="Not Connected")
+            self._set_ui_state(UiState.DISCONNECTED)
+
+    def _connect_failed(self, error):
+        """Update the UI when connecting raised on the serial worker."""
+        log.error("Connection error: %s", error)
+        self.connected = False
+        self.update_status(connected=False, mode="Error")
+        self._set_ui_state(UiState.DISCONNECTED)
+
+    def _enter_led_mode(self):
+        """Fill the strip and grouping dropdowns from the config and enable the LED controls."""
+        self._build_led_controls()
+        self.update_strip_dropdown()  # Update strip options
+        self._set_ui_state(UiState.CONNECTED_LED)
+        self.update_grouping_dropdown()  # Initialize grouping options
 
     def test_connection(self):
         """Test connection and update status."""
-        try:
-            connected, mode = self.client.test_connection()
+        def failed(error):
+            log.error("Test connection error: %s", error)
+            self.update_status(connected=False, mode="Error")
+            self._set_ui_state(UiState.CONNECTED_TERMINAL)
+        
+        def done(result):
+            connected, mode = result
             self.update_status(connected=connected, mode=mode)
             
             # Enable/disable LED controls based on mode
             if connected and mode == "LED":
-                self.enable_led_controls()
+                self._set_ui_state(UiState.CONNECTED_LED)
             else:
-                self.disable_led_controls()
-                
-        except Exception as e:
-            print(f"Test connection error: {e}")
-            self.update_status(connected=False, mode="Error")
-            self.disable_led_controls()
+                self._set_ui_state(UiState.CONNECTED_TERMINAL)
+        
+        self._run_serial(self.client.test_connection, callback=done, errback=failed)
 
     def toggle_mode(self):
-        """Switch between LED and Terminal modes."""
-        try:
-            # First test current mode
-            connected, mode = self.client.test_connection()
-            if not connected:
-                print("Cannot switch mode: not connected")
-                return
-            
-            # Disable all controls during mode switch
-            self.test_conn_btn['state'] = 'disabled'
-            self.mode_btn['state'] = 'disabled'
-            self.disable_led_controls()
-            
-            if mode == "LED":
-                # Send EXIT command to stop LED service
-                response = self.client.send_command("EXIT")
-                print(f"Exit command response: {response}")
-                print("Waiting for LED service to stop...")
-                time.sleep(3)  # Give more time for service to fully stop
-            else:
-                # Start LED service
-                cmd = "sudo systemctl restart led-controller.service"
-                self.client.send_command(cmd)
-                print("Waiting for LED service to start...")
-                time.sleep(5)  # Give more time for service to fully start
-            
-            # Test new mode
-            connected, new_mode = self.client.test_connection()
-            self.update_status(connected=connected, mode=new_mode)
-            
-            # Re-enable controls based on new state
-            self.test_conn_btn['state'] = 'normal'
-            self.mode_btn['state'] = 'normal'
-            
-            # Enable/disable LED controls based on new mode
-            if connected and new_mode == "LED":
-                # Request config after switching to LED mode
-                if self.client.get_config():
-                    print("Configuration received successfully!")
-                    self.update_strip_dropdown()  # Update strip options
-                    self.enable_led_controls()
-                    self.enable_group_controls()  # Enable group controls too
-                    self.update_grouping_dropdown()  # Initialize grouping options
-                else:
-                    print("Warning: Failed to get LED configuration")
-                    self.disable_led_controls()
-                    self.disable_group_controls()
+        """Switch between LED and Terminal modes.
+        
+        Each step runs on the serial worker and continues from its callback, so the
+        window keeps redrawing while the service stops or starts.
+        """
+        # Disable mode and LED controls until the switch has finished
+        self._set_ui_state(UiState.SWITCHING)
+        self.update_status(mode="Switching...")
+        self._mode_switch_gen += 1
+        
+        # First test current mode
+        self._run_serial(self.client.test_connection, callback=self._switch_step(self._begin_mode_switch),
+                         errback=self._switch_step(self._mode_switch_failed))
+
+    def _switch_step(self, func):
+        """Wrap a mode-switch callback so it does nothing once that switch has been abandoned."""
+        gen = self._mode_switch_gen
+        
+        def step(*args):
+            if gen == self._mode_switch_gen:
+                func(*args)
+        return step
+
+    def _begin_mode_switch(self, result):
+        """Stop or start the LED service depending on the current mode."""
+        connected, mode = result
+        if not connected:
+            log.warning("Cannot switch mode: not connected")
+            # Replace the "Switching..." label with what the test reported
+            self.update_status(connected=False, mode=mode)
+            self._set_ui_state(UiState.CONNECTED_TERMINAL)
+            return
+        
+        if mode == "LED":
+            def sent(response):
+                log.debug("Exit command response: %s", response)
+                log.info("Waiting for LED service to stop...")
+                self._wait_for_mode("Terminal", 5000, self._finish_mode_switch)
+            # Send EXIT command to stop LED service
+            self._run_serial(self.client.send_command, "EXIT", callback=self._switch_step(sent),
+                             errback=self._switch_step(self._mode_switch_failed))
+        else:
+            def sent(response):
+                log.info("Waiting for LED service to start...")
+                self._wait_for_mode("LED", 10000, self._finish_mode_switch)
+            # Start LED service
+            cmd = "sudo systemctl restart led-controller.service"
+            self._run_serial(self.client.send_command, cmd, callback=self._switch_step(sent),
+                             errback=self._switch_step(self._mode_switch_failed))
+
+    def _wait_for_mode(self, target, timeout_ms, cb):
+        """Poll the connection every 100 ms until target mode is reported or timeout_ms passes.
+        
+        cb(connected, mode) receives the last test result either way.
+        """
+        deadline = time.monotonic() + timeout_ms / 1000
+        
+        def tested(result):
+            connected, mode = result
+            if (connected and mode == target) or time.monotonic() >= deadline:
+                cb(connected, mode)
             else:
-                self.disable_led_controls()
-                self.disable_group_controls()
-                
-        except Exception as e:
-            print(f"Error toggling mode: {e}")
-            self.update_status(mode="Error")
-            # Re-enable basic controls even on error
-            self.test_conn_btn['state'] = 'normal'
-            self.mode_btn['state'] = 'normal'
-
-    def enable_led_controls(self):
-        """Enable LED control buttons."""
-        for widget in [self.color_btn, self.brightness_btn, self.test_pattern_btn, 
-                      self.off_btn, self.brightness_scale, self.r_entry, 
-                      self.g_entry, self.b_entry, self.strip_dropdown,
-                      self.choose_color_btn,
-                      self.animation_speed_entry, self.strip_effect_dropdown,
-                      self.group_set_effect_dropdown, self.group_effect_dropdown,
-                      self.start_strip_effect_btn, self.start_group_set_effect_btn,
-                      self.start_group_effect_btn, self.stop_all_effects_btn]:
-            if widget in [self.strip_dropdown, self.strip_effect_dropdown, 
-                        self.group_set_effect_dropdown, self.group_effect_dropdown]:
-                widget['state'] = 'readonly'
+                self.root.after(100, self._switch_step(poll))
+        
+        def poll():
+            # A test that raises counts as not connected, and polling carries on
+            self._run_serial(self.client.test_connection, callback=self._switch_step(tested),
+                             errback=self._switch_step(lambda error: tested((False, "Error"))))
+        
+        poll()
+
+    def _finish_mode_switch(self, connected, new_mode):
+        """Enable the controls that match the mode reached after a switch."""
+        self.update_status(connected=connected, mode=new_mode)
+        
+        def configured(config):
+            self.update_status(mode=new_mode)
+            if config:
+                log.info("Configuration received successfully!")
+                self._enter_led_mode()
             else:
-                widget['state'] = 'normal'
-            
-            # Set initial values for effect dropdowns
-            if not self.strip_effect_var.get():
-                self.strip_effect_var.set('Rainbow Wave')
-            if not self.group_set_effect_var.get():
-                self.group_set_effect_var.set('Rainbow Wave')
-            if not self.group_effect_var.get():
-                self.group_effect_var.set('Rainbow Wave')
-
-    def disable_led_controls(self):
-        """Disable LED control buttons."""
-        for widget in [self.color_btn, self.brightness_btn, self.test_pattern_btn, 
-                      self.off_btn, self.brightness_scale, self.r_entry, 
-                      self.g_entry, self.b_entry, self.strip_dropdown,
-                      self.choose_color_btn,
-                      self.animation_speed_entry, self.strip_effect_dropdown,
-                      self.group_set_effect_dropdown, self.group_effect_dropdown,
-                      self.start_strip_effect_btn, self.start_group_set_effect_btn,
-                      self.start_group_effect_btn, self.stop_all_effects_btn]:
-            widget['state'] = 'disabled'
+                log.warning("Failed to get LED configuration")
+                self._set_ui_state(UiState.CONNECTED_TERMINAL)
+        
+        # Enable/disable LED controls based on new mode
+        if connected and new_mode == "LED":
+            # Request config after switching to LED mode
+            self.update_status(mode="Loading config...")
+            self._run_serial(self.client.get_config, callback=self._switch_step(configured),
+                             errback=self._switch_step(lambda error: configured(None)))
+        else:
+            self._set_ui_state(UiState.CONNECTED_TERMINAL)
+
+    def _mode_switch_failed(self, error):
+        """Report a failed mode switch and give the basic controls back."""
+        log.error("Error toggling mode: %s", error)
+        self.update_status(mode="Error")
+        self._set_ui_state(UiState.CONNECTED_TERMINAL)
+
+    def _get_vars(self, *variables):
+        """Read several Tk variables with a single Tcl round-trip, returned as strings."""
+        script = 'list ' + ' '.join(f'[set {{{var}}}]' for var in variables)
+        return self.root.tk.splitlist(self.root.tk.eval(script))
 
     def set_color(self):
         """Set LED color."""
         try:
-            r = int(self.r_var.get())
-            g = int(self.g_var.get())
-            b = int(self.b_var.get())
+            r, g, b = self._get_vars(self.r_var, self.g_var, self.b_var)
+            # Validation only lets digits up to 255 through; a cleared field counts as 0
+            r, g, b = int(r or 0), int(g or 0), int(b or 0)
+            strip_id = self._current_strip_id
             
-            # Convert display name to strip ID
-            strip_name = self.strip_var.get()
-            strip_id = self.strip_name_to_id.get(strip_name, 'ALL')
+            def done(response):
+                log.debug("Color command response: %s", response)
+                if is_error(response):
+                    log.error("Error setting color: %s", response)
             
-            response = self.client.set_strip_color(strip_id, r, g, b)
-            print(f"Color command response: {response}")
+            self._queue_command(('COLOR', strip_id), f"COLOR:{strip_id}:{r},{g},{b}", done)
             
-            if "ERROR" in response:
-                print(f"Error setting color: {response}")
-            
-        except ValueError:
-            print("Invalid color values - must be integers between 0-255")
         except Exception as e:
-            print(f"Error setting color: {e}")
+            log.error("Error setting color: %s", e)
 
-    def set_brightness(self):
-        """Set LED brightness."""
+    def set_brightness(self, brightness=None):
+        """Set LED brightness, defaulting to the slider's current value."""
         try:
-            brightness = self.brightness_var.get()
+            if brightness is None:
+                # IntVar.get() truncates the fractional values the scale writes
+                brightness = self.brightness_var.get()
+            strip_id = self._current_strip_id
             
-            # Convert display name to strip ID
-            strip_name = self.strip_var.get()
-            strip_id = self.strip_name_to_id.get(strip_name, 'ALL')
+            def done(response):
+                log.debug("Brightness command response: %s", response)
+                if is_error(response):
+                    log.error("Error setting brightness: %s", response)
             
-            response = self.client.set_strip_brightness(strip_id, str(brightness))
-            print(f"Brightness command response: {response}")
-            if "ERROR" in response:
-                print(f"Error setting brightness: {response}")
+            self._queue_command(('BRIGHTNESS', strip_id), f"BRIGHTNESS:{strip_id}:{brightness}", done)
         except ValueError:
-            print("Invalid brightness value")
+            log.warning("Invalid brightness value")
+
+    def _on_brightness_change(self, value):
+        """Record the latest slider value and send it at most every 30 ms while dragging."""
+        self._bright_latest = int(float(value))
+        if not self._bright_after:
+            self._bright_after = self.root.after(30, self._commit_brightness)
+
+    def _commit_brightness(self):
+        """Send the most recent slider value."""
+        self._bright_after = None
+        if self.connected:
+            self.set_brightness(self._bright_latest)
 
     def test_pattern(self):
         """Run LED test pattern."""
-        response = self.client.test_pattern()
-        if "ERROR" in response:
-            print(f"Error running test pattern: {response}")
+        def done(response):
+            if is_error(response):
+                log.error("Error running test pattern: %s", response)
+        self._queue_command(('TEST',), "TEST", done)
 
     def turn_off(self):
         """Turn off LEDs."""
-        response = self.client.turn_off()
-        if "ERROR" in response:
-            print(f"Error turning off LEDs: {response}")
+        def done(response):
+            if is_error(response):
+                log.error("Error turning off LEDs: %s", response)
+        self._queue_command(('OFF',), "OFF", done)
 
     def update_strip_dropdown(self):
         """Update strip dropdown with available strips from config."""
         if self.client.config:
-            # Create a mapping of display names to strip IDs
-            self.strip_name_to_id = {'All Strips': 'ALL'}
-            for strip in self.client.config['strips']:
-                self.strip_name_to_id[strip['name']] = str(strip['id'])
+            strips_sig = tuple((strip['id'], strip['name']) for strip in self.client.config['strips'])
+            if strips_sig != self._dropdown_values.get('strips'):
+                # Build the display names and both name <-> strip ID mappings in one pass
+                names = ['All Strips']
+                name_to_id = {'All Strips': 'ALL'}
+                id_to_name = {}
+                for strip_id, name in strips_sig:
+                    names.append(name)
+                    name_to_id[name] = str(strip_id)
+                    id_to_name[str(strip_id)] = name
+                self.strip_name_to_id = name_to_id
+                self._strip_id_to_name = id_to_name
+                self._set_dropdown_values(self.strip_dropdown, names)
+                self._dropdown_values['strips'] = strips_sig
             
-            # Update dropdown with display names
-            strip_names = ['All Strips'] + [strip['name'] for strip in self.client.config['strips']]
-            self.strip_dropdown['values'] = strip_names
+            # Groups can change without the strip list changing, so always re-index them
+            self._build_grouping_index()
             
-            # Set initial value
-            current_id = self.strip_var.get()
-            if current_id == 'ALL':
-                self.strip_var.set('All Strips')
-            else:
-                # Find name for current ID
-                for strip in self.client.config['strips']:
-                    if str(strip['id']) == current_id:
-                        self.strip_var.set(strip['name'])
-                        break
-                else:
-                    self.strip_var.set('All Strips')
+            # Keep the selected strip if it still exists; strip_var holds its display name
+            current_name = self.strip_var.get()
+            if current_name not in self.strip_name_to_id:
+                current_name = 'All Strips'
+                self.strip_var.set(current_name)
+            self._current_strip_id = self.strip_name_to_id[current_name]
+
+    def _set_dropdown_values(self, dropdown, values):
+        """Assign a combobox's values only if they differ from what it already holds."""
+        values = tuple(values)
+        key = str(dropdown)
+        if self._dropdown_values.get(key) != values:
+            dropdown['values'] = values
+            self._dropdown_values[key] = values
+
+    def _build_grouping_index(self):
+        """Index groupings by name and groups by dropdown label for every strip in the config."""
+        self._grouping_index = {}
+        self._group_dropdown_for = None
+        self._current_group = None
+        for strip in self.client.config['strips']:
+            self._grouping_index[str(strip['id'])] = {
+                g['name']: {
+                    'grouping': g,
+                    # Keys double as the group dropdown values, in config order
+                    'groups_by_label': {f"{x['id']}: {x['name']}": x for x in g['groups']}
+                }
+                for g in strip.get('group_sets', [])
+            }
 
     def update_grouping_dropdown(self):
         """Update grouping dropdown based on selected strip."""
-        strip_name = self.strip_var.get()
-        if strip_name == 'All Strips':
+        strip_id = self._current_strip_id
+        if strip_id == 'ALL':
             return
         
-        strip_id = self.strip_name_to_id.get(strip_name)
-        
         if strip_id and self.client.config:
-            groups = self.client.get_available_groups(strip_id)
-            if groups:
-                self.grouping_dropdown['values'] = [g['name'] for g in groups]
-                self.grouping_var.set(groups[0]['name'])
-                self.update_group_dropdown()
+            groupings = self._grouping_index.get(strip_id)
+            if groupings:
+                names = list(groupings)
+                self._set_dropdown_values(self.grouping_dropdown, names)
+                self.grouping_var.set(names[0])
+                self._show_groups(strip_id, names[0])
             else:
-                print(f"No groups found for strip {strip_name}")
-                self.grouping_dropdown['values'] = []
-                self.group_dropdown['values'] = []
+                log.warning("No groups found for strip %s", strip_id)
+                self._set_dropdown_values(self.grouping_dropdown, [])
+                self._set_dropdown_values(self.group_dropdown, [])
                 self.group_var.set('')
+                self._group_dropdown_for = None
+                self._current_group = None
 
     def update_group_dropdown(self, event=None):
+        """Debounce grouping selections so arrowing through the list only rebuilds once."""
+        if self._grouping_select_after:
+            self.root.after_cancel(self._grouping_select_after)
+        self._grouping_select_after = self.root.after(50, self._do_update_group_dropdown)
+
+    def _do_update_group_dropdown(self):
         """Update group dropdown based on selected grouping."""
-        strip_name = self.strip_var.get()
-        strip_id = self.strip_name_to_id.get(strip_name)
-        grouping_name = self.grouping_var.get()
+        self._grouping_select_after = None
+        self._show_groups(self._current_strip_id, self.grouping_var.get())
+
+    def _show_groups(self, strip_id, grouping_name):
+        """List the groups of a grouping, unless the dropdown already shows them."""
+        if (strip_id, grouping_name) == self._group_dropdown_for:
+            return
         
         if strip_id and grouping_name and self.client.config:
-            groups = self.client.get_available_groups(strip_id)
-            grouping = next((g for g in groups if g['name'] == grouping_name), None)
-            if grouping:
-                self.group_dropdown['values'] = [f"{g['id']}: {g['name']}" for g in grouping['groups']]
-                if grouping['groups']:
-                    self.group_var.set(f"{grouping['groups'][0]['id']}: {grouping['groups'][0]['name']}")
-
-    def enable_group_controls(self):
-        """Enable group control widgets."""
-        for widget in [self.grouping_dropdown, self.group_dropdown, 
-                      self.group_r_entry, self.group_g_entry, self.group_b_entry,
-                      self.group_color_btn]:
-            if widget in [self.grouping_dropdown, self.group_dropdown]:
-                widget['state'] = 'readonly'
-            else:
-                widget['state'] = 'normal'
+            entry = self._grouping_index.get(strip_id, {}).get(grouping_name)
+            if entry:
+                self._group_dropdown_for = (strip_id, grouping_name)
+                labels = list(entry['groups_by_label'])
+                self._set_dropdown_values(self.group_dropdown, labels)
+                self.group_var.set(labels[0] if labels else '')
+                self._on_group_selected()
+
+    def _on_group_selected(self, event=None):
+        """Resolve the selected group once so set_group_color does not have to."""
+        self._current_group = None
+        if not self._group_dropdown_for:
+            return
+        strip_id, grouping_name = self._group_dropdown_for
+        entry = self._grouping_index.get(strip_id, {}).get(grouping_name)
+        group = entry['groups_by_label'].get(self.group_var.get()) if entry else None
+        if group:
+            self._current_group = (strip_id, str(group['id']), group)
 
     def disable_group_controls(self):
         """Disable group control widgets."""
-        for widget in [self.grouping_dropdown, self.group_dropdown, 
-                      self.group_r_entry, self.group_g_entry, self.group_b_entry,
-                      self.group_color_btn]:
-            widget['state'] = 'disabled'
+        if hasattr(self, '_disable_group_script'):
+            self.root.tk.eval(self._disable_group_script)
 
     def set_group_color(self):
         """Set color for selected group."""
         try:
-            strip_name = self.strip_var.get()
-            strip_id = self.strip_name_to_id.get(strip_name)
-            group_selection = self.group_var.get()
-            
-            if not group_selection:
+            if not self._current_group:
                 return
-                
-            group_id = group_selection.split(':')[0]
-            grouping_name = self.grouping_var.get()
+            strip_id, group_id, group = self._current_group
             
-            # Get the LED list for this group
-            groups = self.client.get_available_groups(strip_id)
-            grouping = next((g for g in groups if g['name'] == grouping_name), None)
-            if not grouping:
-                return
-                
-            group = next((g for g in grouping['groups'] if str(g['id']) == group_id), None)
-            if not group:
-                return
+            r, g, b = self._get_vars(self.group_r_var, self.group_g_var, self.group_b_var)
+            # Validation only lets digits up to 255 through; a cleared field counts as 0
+            r, g, b = int(r or 0), int(g or 0), int(b or 0)
             
-            try:
-                r = int(self.group_r_var.get())
-                g = int(self.group_g_var.get())
-                b = int(self.group_b_var.get())
-                
-                if not all(0 <= x <= 255 for x in (r, g, b)):
-                    print("Color values must be between 0-255")
-                    return
-                    
-                response = self.client.set_group_color(strip_id, group['leds'], r, g, b)
-                print(f"Group color command response: {response}")
-                
-            except ValueError:
-                print("Invalid color values - must be integers between 0-255")
+            def done(response):
+                log.debug("Group color command response: %s", response)
+            
+            led_list = ','.join(str(x) for x in group['leds'])
+            self._queue_command(('GROUP_COLOR', strip_id, group_id),
+                                f"GROUP_COLOR:{strip_id}:{led_list}:{r},{g},{b}", done)
                 
         except Exception as e:
-            print(f"Error setting group color: {e}")
+            log.error("Error setting group color: %s", e)
 
     def on_strip_selected(self, event=None):
+        """Debounce strip selections so only the final one updates the group controls."""
+        # The send paths use the new strip straight away; only the group refresh waits
+        self._current_strip_id = self.strip_name_to_id.get(self.strip_var.get(), 'ALL')
+        if self._strip_select_after:
+            self.root.after_cancel(self._strip_select_after)
+        self._strip_select_after = self.root.after(50, self._do_strip_selected)
+
+    def _do_strip_selected(self):
         """Handle strip selection."""
-        if self.strip_var.get() == 'All Strips':
-            self.disable_group_controls()
-            self.start_group_set_effect_btn['state'] = 'disabled'
-            self.start_group_effect_btn['state'] = 'disabled'
+        self._strip_select_after = None
+        if self._current_strip_id == 'ALL':
+            self.root.tk.eval(self._all_strips_script)
         else:
-            self.enable_group_controls()
+            self.root.tk.eval(self._single_strip_script)
             self.update_grouping_dropdown()
-            self.start_group_set_effect_btn['state'] = 'normal'
-            self.start_group_effect_btn['state'] = 'normal'
 
     def open_config_editor(self):
         """Open the configuration editor window."""
         from config_manager import ConfigEditorWindow, LEDConfigManager
         config_manager = LEDConfigManager(self.client)
-        editor = ConfigEditorWindow(self.root, config_manager)
+        editor = ConfigEditorWindow(self.root, config_manager, run_serial=self._run_serial)
+
+    def _run_effects_call(self, func, *args, callback):
+        """Run an effect start/stop on the serial worker.
+        
+        callback gets (response, active_effects), where active_effects is a copy of the
+        client's dict taken on the worker, the only thread that changes it.
+        """
+        def call():
+            return func(*args), self.client.get_active_effects()
+        
+        self._run_serial(call, callback=lambda result: callback(*result))
+
+    def _start_effect(self, description, func, *args):
+        """Run an effect-starting client call and refresh the active effects list on success."""
+        def done(response, active_effects):
+            log.debug("%s effect response: %s", description.capitalize(), response)
+            if is_error(response):
+                log.error("Error starting %s effect: %s", description, response)
+            elif is_ok(response):
+                log.info("Effect started successfully")
+                self.update_active_effects_list(active_effects)
+        
+        self._run_effects_call(func, *args, callback=done)
+
+    def _resolve_grouping(self):
+        """Return the current strip ID and the grouping index entry selected for it, or None."""
+        strip_id = self._current_strip_id
+        if strip_id == 'ALL':
+            log.warning("Please select a specific strip for group effects")
+            return None
+        
+        grouping_name = self.grouping_var.get()
+        if not grouping_name:
+            log.warning("Please select a grouping")
+            return None
+        
+        entry = self._grouping_index.get(strip_id, {}).get(grouping_name)
+        if not entry:
+            log.warning("Selected grouping not found")
+            return None
+        return strip_id, entry
 
     def start_strip_effect(self):
         """Start effect on entire strip."""
         try:
-            strip_name = self.strip_var.get()
-            strip_id = self.strip_name_to_id.get(strip_name, 'ALL')
             effect = self.strip_effect_var.get()
-            wait_ms = int(self.animation_speed_var.get())
+            wait_ms = self.animation_speed_var.get()
             
             if not effect:
-                print("Please select an effect")
+                log.warning("Please select an effect")
                 return
             
             if wait_ms <= 0:
-                print("Animation speed must be greater than 0")
+                log.warning("Animation speed must be greater than 0")
                 return
             
             if effect == 'Rainbow Wave':
-                response = self.client.start_rainbow_wave(strip_id, wait_ms)
-                print(f"Strip effect response: {response}")
-                if "ERROR" in response:
-                    print(f"Error starting strip effect: {response}")
-                elif "OK" in response:
-                    print("Effect started successfully")
-                    self.update_active_effects_list()
+                self._start_effect("strip", self.client.start_rainbow_wave, self._current_strip_id, wait_ms)
             else:
-                print(f"Unknown effect: {effect}")
-        except ValueError:
-            print("Invalid animation speed - must be a positive integer")
+                log.warning("Unknown effect: %s", effect)
+        except tk.TclError:
+            # Validation only lets an empty field through
+            log.warning("Invalid animation speed - must be a positive integer")
         except Exception as e:
-            print(f"Error starting strip effect: {e}")
+            log.error("Error starting strip effect: %s", e)
 
     def start_group_set_effect(self):
         """Start effect on group set."""
         try:
-            strip_name = self.strip_var.get()
-            if strip_name == 'All Strips':
-                print("Please select a specific strip for group effects")
+            resolved = self._resolve_grouping()
+            if not resolved:
                 return
-                
-            strip_id = self.strip_name_to_id.get(strip_name)
-            grouping_name = self.grouping_var.get()
+            strip_id, entry = resolved
             effect = self.group_set_effect_var.get()
-            
-            if not grouping_name:
-                print("Please select a grouping")
-                return
-                
-            # Find grouping ID
-            groups = self.client.get_available_groups(strip_id)
-            grouping = next((g for g in groups if g['name'] == grouping_name), None)
-            if not grouping:
-                print("Selected grouping not found")
-                return
-                
-            wait_ms = int(self.animation_speed_var.get())
+            wait_ms = self.animation_speed_var.get()
             
             if effect == 'Rainbow Wave':
-                response = self.client.start_group_rainbow_wave(strip_id, grouping['id'], wait_ms)
-                print(f"Group set effect response: {response}")
-                if "ERROR" in response:
-                    print(f"Error starting group set effect: {response}")
-                elif "OK" in response:
-                    print("Effect started successfully")
-                    self.update_active_effects_list()
+                self._start_effect("group set", self.client.start_group_rainbow_wave,
+                                   strip_id, entry['grouping']['id'], wait_ms)
             else:
-                print(f"Unknown effect: {effect}")
-        except ValueError:
-            print("Invalid animation speed - must be a positive integer")
+                log.warning("Unknown effect: %s", effect)
+        except tk.TclError:
+            # Validation only lets an empty field through
+            log.warning("Invalid animation speed - must be a positive integer")
         except Exception as e:
-            print(f"Error starting group set effect: {e}")
+            log.error("Error starting group set effect: %s", e)
 
     def start_group_effect(self):
         """Start effect on individual group."""
         try:
-            strip_name = self.strip_var.get()
-            if strip_name == 'All Strips':
-                print("Please select a specific strip for group effects")
+            resolved = self._resolve_grouping()
+            if not resolved:
                 return
-                
-            strip_id = self.strip_name_to_id.get(strip_name)
-            grouping_name = self.grouping_var.get()
+            strip_id, entry = resolved
             group_selection = self.group_var.get()
-            effect = self.group_effect_var.get()
-            
-            if not grouping_name or not group_selection:
-                print("Please select a grouping and group")
+            if not group_selection:
+                log.warning("Please select a group")
                 return
-                
-            # Find grouping ID and group ID
-            groups = self.client.get_available_groups(strip_id)
-            grouping = next((g for g in groups if g['name'] == grouping_name), None)
-            if not grouping:
-                print("Selected grouping not found")
+            group = entry['groups_by_label'].get(group_selection)
+            if not group:
+                log.warning("Selected group not found")
                 return
-                
-            group_id = group_selection.split(':')[0]
-            wait_ms = int(self.animation_speed_var.get())
+            effect = self.group_effect_var.get()
+            wait_ms = self.animation_speed_var.get()
             
             if effect == 'Rainbow Wave':
-                response = self.client.start_individual_group_rainbow_wave(
-                    strip_id, grouping['id'], int(group_id), wait_ms)
-                print(f"Individual group effect response: {response}")
-                if "ERROR" in response:
-                    print(f"Error starting individual group effect: {response}")
-                elif "OK" in response:
-                    print("Effect started successfully")
-                    self.update_active_effects_list()
+                self._start_effect("individual group", self.client.start_individual_group_rainbow_wave,
+                                   strip_id, entry['grouping']['id'], int(group['id']), wait_ms)
             else:
-                print(f"Unknown effect: {effect}")
-        except ValueError:
-            print("Invalid animation speed - must be a positive integer")
+                log.warning("Unknown effect: %s", effect)
+        except tk.TclError:
+            # Validation only lets an empty field through
+            log.warning("Invalid animation speed - must be a positive integer")
         except Exception as e:
-            print(f"Error starting individual group effect: {e}")
+            log.error("Error starting individual group effect: %s", e)
 
-    def update_active_effects_list(self):
-        """Update the active effects listbox."""
-        self.active_effects_listbox.delete(0, tk.END)
-        active_effects = self.client.get_active_effects()
-        
+    def update_active_effects_list(self, active_effects):
+        """Update the active effects listbox from a snapshot of the client's active effects."""
         if not active_effects:
-            self.active_effects_listbox.insert(tk.END, "No active effects")
+            self._set_effects_model(["No active effects"])
             self.stop_all_effects_btn['state'] = 'disabled'
             return
             
+        model = []
         for strip_id, effect in active_effects.items():
-            # Find strip name
-            strip = next((s for s in self.client.config['strips'] if str(s['id']) == strip_id), None)
-            strip_name = strip['name'] if strip else f"Strip {strip_id}"
+            strip_name = self._strip_id_to_name.get(strip_id, f"Strip {strip_id}")
             
             # Format effect info
             effect_type = effect['type'].replace('_', ' ').title()
@@ -737,32 +1066,56 @@ class LEDGUI:
             else:
                 effect_str = f"{strip_name}: {effect_type}"
                 
-            self.active_effects_listbox.insert(tk.END, effect_str)
+            model.append(effect_str)
             
+        self._set_effects_model(model)
         self.stop_all_effects_btn['state'] = 'normal'
 
+    def _set_effects_model(self, items):
+        """Replace the listbox contents with one variable write, skipping it if nothing changed."""
+        if items != self._effects_model:
+            self._effects_model = items
+            self._effects_var.set(tuple(items))
+
     def stop_all_effects(self):
         """Stop all active effects."""
-        response = self.client.stop_effect()
-        print(f"Stop all effects response: {response}")
-        if "ERROR" in response:
-            print(f"Error stopping effects: {response}")
-        self.update_active_effects_list()
+        def done(response, active_effects):
+            log.debug("Stop all effects response: %s", response)
+            if is_error(response):
+                log.error("Error stopping effects: %s", response)
+            self.update_active_effects_list(active_effects)
+        self._run_effects_call(self.client.stop_effect, callback=done)
 
     def open_color_chooser(self):
         """Open color chooser dialog and update RGB fields."""
+        from tkinter import colorchooser
         # Askcolor returns a tuple ((r, g, b), hex_color_string) or (None, None)
         color_code = colorchooser.askcolor(title="Choose color")
         if color_code and color_code[0]:  # Check if a color was chosen
             r, g, b = color_code[0]  # Get the (r, g, b) tuple
-            self.r_var.set(str(int(r)))
-            self.g_var.set(str(int(g)))
-            self.b_var.set(str(int(b)))
+            self.r_var.set(int(r))
+            self.g_var.set(int(g))
+            self.b_var.set(int(b))
 
 def main():
+    parser = argparse.ArgumentParser(description="LED Controller GUI")
+    parser.add_argument('--debug', action='store_true', help="log every command response")
+    parser.add_argument('--log-pane', action='store_true', help="show log output inside the window")
+    args = parser.parse_args()
+    
+    # Console writes happen on a listener thread so logging never blocks the Tk loop
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO, format='%(message)s',
+                        handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
+    
     root = tk.Tk()
-    app = LEDGUI(root)
-    root.mainloop()
+    try:
+        app = LEDGUI(root, show_log=args.log_pane)
+        root.mainloop()
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
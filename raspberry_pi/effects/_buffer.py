@@ -0,0 +1,17 @@
+import ctypes
+import numpy as np
+from rpi_ws281x import ws
+
+def led_buffer(strip):
+    """Return a ctypes uint32 array aliasing the strip's LED colors.
+
+    Writing into it is what setPixelColor() does one LED at a time, so effects
+    can fill a whole frame without a Python-to-C call per LED. strip.show()
+    renders it as usual. Only valid after strip.begin().
+    """
+    address = int(ws.ws2811_channel_t_leds_get(strip._channel))
+    return (ctypes.c_uint32 * strip.numPixels()).from_address(address)
+
+def led_array(strip):
+    """Return the strip's LED colors as a NumPy uint32 array sharing led_buffer()'s memory."""
+    return np.ctypeslib.as_array(led_buffer(strip))
@@ -0,0 +1,62 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy versions below are used instead
+    njit = None
+
+def fill_frame(buf, phase, j, lut, index):
+    """Write lut[(phase[i] + j) & 255] into buf[i] for every LED.
+
+    index is a uint8 scratch array the size of phase.
+    """
+    np.add(phase, j, out=index, casting='unsafe')
+    np.take(lut, index, out=buf)
+
+def scatter_frame(buf, led_ids, led_phase, j, lut, index, colors):
+    """Write lut[(led_phase[k] + j) & 255] into buf[led_ids[k]] for every k.
+
+    index and colors are uint8 and uint32 scratch arrays the size of led_ids,
+    so a frame allocates nothing.
+    """
+    np.add(led_phase, j, out=index, casting='unsafe')
+    np.take(lut, index, out=colors)
+    np.put(buf, led_ids, colors)
+
+def put_color(buf, led_ids, color):
+    """Write color into buf at every in-range index in led_ids.
+
+    Out-of-range and negative ids are skipped, as setPixelColor() skips them.
+    """
+    buf[led_ids[(led_ids >= 0) & (led_ids < buf.size)]] = color
+
+if njit is not None:
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def fill_frame(buf, phase, j, lut, index):
+        for i in range(phase.size):
+            buf[i] = lut[(phase[i] + j) & 255]
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def scatter_frame(buf, led_ids, led_phase, j, lut, index, colors):
+        for k in range(led_ids.size):
+            buf[led_ids[k]] = lut[(led_phase[k] + j) & 255]
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def put_color(buf, led_ids, color):
+        for k in range(led_ids.size):
+            led = led_ids[k]
+            if 0 <= led < buf.size:
+                buf[led] = color
+
+    # Compile (or load from cache) now rather than on an effect's first frame
+    _buf = np.zeros(1, dtype=np.uint32)
+    _phase = np.zeros(1, dtype=np.uint8)
+    _lut = np.zeros(256, dtype=np.uint32)
+    fill_frame(_buf, _phase, 0, _lut, _phase)
+    scatter_frame(_buf, np.zeros(1, dtype=np.intp), _phase, 0, _lut, _phase, _buf)
+    _leds = np.zeros(1, dtype=np.intp)
+    put_color(_buf, _leds, 0)
+    # GROUP_COLOR passes parse_leds()'s read-only arrays, which Numba compiles separately
+    _leds.flags.writeable = False
+    put_color(_buf, _leds, 0)
+    del _buf, _phase, _lut, _leds
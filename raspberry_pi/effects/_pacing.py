@@ -0,0 +1,22 @@
+import time
+
+class FramePacer:
+    """Schedules frames wait_ms apart, start to start.
+
+    Time spent drawing and showing a frame comes out of the wait instead of
+    being added to it, so the frame rate doesn't drift with strip length.
+    """
+
+    def __init__(self, wait_ms):
+        self.period = wait_ms / 1000.0
+        self.deadline = time.monotonic()
+
+    def wait(self, stop_event):
+        """Wait until the next frame is due; return True if stop_event was set meanwhile."""
+        self.deadline += self.period
+        delay = self.deadline - time.monotonic()
+        if delay < 0:
+            # Running behind; restart the schedule from now rather than rushing to catch up
+            self.deadline -= delay
+            delay = 0
+        return stop_event.wait(delay)
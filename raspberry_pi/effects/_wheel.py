@@ -0,0 +1,21 @@
+import numpy as np
+
+def _wheel_lut():
+    """Build the 256-position rainbow wheel (green -> red -> blue -> green), packed the way Color() packs."""
+    pos = np.arange(256, dtype=np.uint32)
+    rise = (pos % 85) * 3  # 0-252 across each third of the wheel
+    rise[255] = 255        # 255 is the only position 85 steps into its third
+    fall = 255 - rise
+    zero = np.zeros_like(pos)
+    third = np.minimum(pos // 85, 2)
+    r = np.choose(third, (rise, fall, zero))
+    g = np.choose(third, (fall, zero, rise))
+    b = np.choose(third, (zero, rise, fall))
+    return (r << 16) | (g << 8) | b
+
+# The wheel only has 256 positions, so frames index this table instead of computing colors per LED
+WHEEL_LUT = _wheel_lut()
+
+def wheel_phase(count):
+    """Spread count offsets evenly around the 256-step wheel."""
+    return (np.arange(count, dtype=np.uint32) * 256 // max(count, 1)).astype(np.uint8)
@@ -1,17 +1,23 @@
-import time
+import logging
 import threading # Although Event is passed in, good practice to import
-from rpi_ws281x import Color
-
-def wheel(pos):
-    """Generate rainbow colors across 0-255 positions."""
-    if pos < 85:
-        return Color(pos * 3, 255 - pos * 3, 0)
-    elif pos < 170:
-        pos -= 85
-        return Color(255 - pos * 3, 0, pos * 3)
-    else:
-        pos -= 170
-        return Color(0, pos * 3, 255 - pos * 3)
+import numpy as np
+from effects._buffer import led_array
+from effects._kernels import scatter_frame
+from effects._wheel import wheel_phase, WHEEL_LUT
+from effects._pacing import FramePacer
+
+log = logging.getLogger(__name__)
+
+def _scatter_indices(leds, groups, group_phase):
+    """Flatten groups into LED ids and the wheel phase of each, dropping out-of-range ids.
+
+    setPixelColor() silently ignores out-of-range LEDs, so the vectorized writes do too.
+    """
+    # One flat array of LED ids plus a parallel array of the group each belongs to
+    led_ids = np.fromiter((led for group in groups for led in group), dtype=np.intp)
+    group_ids = np.fromiter((gi for gi, group in enumerate(groups) for _ in group), dtype=np.intp)
+    in_range = (led_ids >= 0) & (led_ids < len(leds))
+    return led_ids[in_range], group_phase[group_ids[in_range]]
 
 def rainbow_wave_group(strip, group_set, stop_event, wait_ms=20):
     """Apply rainbow wave effect to groups of LEDs until stopped.
@@ -20,43 +26,28 @@ def rainbow_wave_group(strip, group_set, stop_event, wait_ms=20):
         strip: The LED strip object
         group_set: List of LED groups, where each group is a list of LED indices
         stop_event: A threading.Event() to signal stopping.
-        wait_ms: Time to wait between updates (in milliseconds)
+        wait_ms: Time from one update to the next (in milliseconds)
     """
     j = 0
+    # Each group's offset into the wheel is fixed for the life of the effect
+    group_phase = wheel_phase(len(group_set))
+    # Every LED takes its group's phase, so a frame is one gather and one scatter in NumPy
+    leds = led_array(strip)
+    led_ids, led_phase = _scatter_indices(leds, group_set, group_phase)
+    index = np.empty(len(led_ids), dtype=np.uint8)
+    colors = np.empty(len(led_ids), dtype=np.uint32)
+    show = strip.show
+    pacer = FramePacer(wait_ms)
 
     while not stop_event.is_set():
         try:
             # Update each group with its own color in the rainbow
-            for group_index, group in enumerate(group_set):
-                # Check stop_event frequently
-                if stop_event.is_set():
-                    break
-                # Calculate color for this group based on its position
-                color = wheel((int(group_index * 256 / len(group_set)) + j) & 255)
-
-                # Apply the color to all LEDs in this group
-                for led in group:
-                    # Check stop_event even more frequently if groups are large
-                    if stop_event.is_set():
-                        break
-                    strip.setPixelColor(led, color)
-                if stop_event.is_set(): # Break outer loop if needed
-                    break
-
-            if stop_event.is_set(): # Check again before showing and sleeping
-                break
+            scatter_frame(leds, led_ids, led_phase, j, WHEEL_LUT, index, colors)
 
-            strip.show()
+            show()
 
-            # Wait for specified time, checking event periodically
-            step_wait_ms = 10 # Check every 10ms
-            total_wait_ms = wait_ms
-            while total_wait_ms > 0 and not stop_event.is_set():
-                sleep_chunk = min(step_wait_ms, total_wait_ms)
-                time.sleep(sleep_chunk / 1000.0)
-                total_wait_ms -= sleep_chunk
-
-            if stop_event.is_set():
+            # Wait for the next frame; returns early as soon as the effect is stopped
+            if pacer.wait(stop_event):
                 break
 
             # Increment position in color wheel
@@ -65,11 +56,11 @@ def rainbow_wave_group(strip, group_set, stop_event, wait_ms=20):
         except KeyboardInterrupt:
             break
         except Exception as e:
-            print(f"Error in rainbow_wave_group: {e}")
+            log.error("Error in rainbow_wave_group: %s", e)
             break # Exit on other errors
 
     # Cleanup handled by led_controller.py
-    print("Rainbow wave group effect loop finished.")
+    log.debug("Rainbow wave group effect loop finished.")
 
 def rainbow_wave_individual_group(strip, group, stop_event, wait_ms=20):
     """Apply rainbow wave effect to a single group of LEDs until stopped.
@@ -78,32 +69,28 @@ def rainbow_wave_individual_group(strip, group, stop_event, wait_ms=20):
         strip: The LED strip object
         group: List of LED indices in the group
         stop_event: A threading.Event() to signal stopping.
-        wait_ms: Time to wait between updates (in milliseconds)
+        wait_ms: Time from one update to the next (in milliseconds)
     """
     j = 0
+    # Each LED's offset into the wheel is fixed for the life of the effect
+    phase = wheel_phase(len(group))
+    # Each LED is a group of one, so a frame is one gather and one scatter in NumPy
+    leds = led_array(strip)
+    led_ids, led_phase = _scatter_indices(leds, [[led] for led in group], phase)
+    index = np.empty(len(led_ids), dtype=np.uint8)
+    colors = np.empty(len(led_ids), dtype=np.uint32)
+    show = strip.show
+    pacer = FramePacer(wait_ms)
 
     while not stop_event.is_set():
         try:
             # Calculate and set colors for each LED in the group
-            for i, led in enumerate(group):
-                if stop_event.is_set():
-                    break
-                strip.setPixelColor(led, wheel((int(i * 256 / len(group)) + j) & 255))
-
-            if stop_event.is_set(): # Check again before showing and sleeping
-                break
-
-            strip.show()
+            scatter_frame(leds, led_ids, led_phase, j, WHEEL_LUT, index, colors)
 
-            # Wait for specified time, checking event periodically
-            step_wait_ms = 10 # Check every 10ms
-            total_wait_ms = wait_ms
-            while total_wait_ms > 0 and not stop_event.is_set():
-                sleep_chunk = min(step_wait_ms, total_wait_ms)
-                time.sleep(sleep_chunk / 1000.0)
-                total_wait_ms -= sleep_chunk
+            show()
 
-            if stop_event.is_set():
+            # Wait for the next frame; returns early as soon as the effect is stopped
+            if pacer.wait(stop_event):
                 break
 
             # Increment position in color wheel
@@ -112,8 +99,8 @@ def rainbow_wave_individual_group(strip, group, stop_event, wait_ms=20):
         except KeyboardInterrupt:
             break
         except Exception as e:
-            print(f"Error in rainbow_wave_individual_group: {e}")
+            log.error("Error in rainbow_wave_individual_group: %s", e)
             break # Exit on other errors
 
     # Cleanup handled by led_controller.py
-    print("Rainbow wave individual group effect loop finished.")
\ No newline at end of file
+    log.debug("Rainbow wave individual group effect loop finished.")
\ No newline at end of file
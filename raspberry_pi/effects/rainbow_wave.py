@@ -1,16 +1,11 @@
-import time
-from rpi_ws281x import Color
-
-def wheel(pos):
-    """Generate rainbow colors across 0-255 positions."""
-    if pos < 85:
-        return Color(pos * 3, 255 - pos * 3, 0)
-    elif pos < 170:
-        pos -= 85
-        return Color(255 - pos * 3, 0, pos * 3)
-    else:
-        pos -= 170
-        return Color(0, pos * 3, 255 - pos * 3)
+import logging
+import numpy as np
+from effects._buffer import led_array
+from effects._kernels import fill_frame
+from effects._wheel import wheel_phase, WHEEL_LUT
+from effects._pacing import FramePacer
+
+log = logging.getLogger(__name__)
 
 def rainbow_wave(strip, stop_event, wait_ms=20):
     """Apply rainbow wave effect to the entire strip until stopped.
@@ -18,35 +13,28 @@ def rainbow_wave(strip, stop_event, wait_ms=20):
     Args:
         strip: The LED strip object
         stop_event: A threading.Event() to signal stopping.
-        wait_ms: Time to wait between updates (in milliseconds)
+        wait_ms: Time from one update to the next (in milliseconds)
     """
     j = 0
+    # Each pixel's offset into the wheel is fixed for the life of the effect
+    n = strip.numPixels()
+    phase = wheel_phase(n)
+    # Frames are computed in NumPy straight into the strip's LED buffer;
+    # the uint8 index wraps at 256 on its own
+    leds = led_array(strip)
+    index = np.empty(n, dtype=np.uint8)
+    show = strip.show
+    pacer = FramePacer(wait_ms)
 
     while not stop_event.is_set():
         try:
-            # Calculate and set colors for each pixel
-            for i in range(strip.numPixels()):
-                # Check stop_event frequently within the inner loop
-                if stop_event.is_set():
-                    break
-                strip.setPixelColor(i, wheel((int(i * 256 / strip.numPixels()) + j) & 255))
-
-            if stop_event.is_set(): # Check again before showing and sleeping
-                break
-
-            strip.show()
+            # Calculate the whole frame in one kernel call
+            fill_frame(leds, phase, j, WHEEL_LUT, index)
 
-            # Wait for specified time, checking event periodically
-            # Instead of a single long sleep, sleep in smaller chunks
-            # to check the stop_event more frequently.
-            step_wait_ms = 10 # Check every 10ms
-            total_wait_ms = wait_ms
-            while total_wait_ms > 0 and not stop_event.is_set():
-                sleep_chunk = min(step_wait_ms, total_wait_ms)
-                time.sleep(sleep_chunk / 1000.0)
-                total_wait_ms -= sleep_chunk
+            show()
 
-            if stop_event.is_set():
+            # Wait for the next frame; returns early as soon as the effect is stopped
+            if pacer.wait(stop_event):
                 break
 
             # Increment position in color wheel
@@ -55,8 +43,8 @@ def rainbow_wave(strip, stop_event, wait_ms=20):
         except KeyboardInterrupt:
             break # Allow Ctrl+C to break the loop if run standalone
         except Exception as e:
-            print(f"Error in rainbow_wave: {e}")
+            log.error("Error in rainbow_wave: %s", e)
             break # Exit on other errors
 
     # Cleanup (turning off LEDs) is now handled by led_controller.py
-    print("Rainbow wave effect loop finished.")
\ No newline at end of file
+    log.debug("Rainbow wave effect loop finished.")
\ No newline at end of file
@@ -3,9 +3,79 @@ import serial
 import json
 import os
 import threading
+import queue
+import subprocess
+import logging
+import argparse
+from functools import lru_cache
+import numpy as np
 from rpi_ws281x import ws, Color, Adafruit_NeoPixel
 from effects.rainbow_wave import rainbow_wave
 from effects.grouped_rainbow_wave import rainbow_wave_group, rainbow_wave_individual_group
+from effects._buffer import led_array
+from effects._kernels import put_color
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+OFF = Color(0, 0, 0)
+WHITE = Color(255, 255, 255)
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same thing
+json_loads = orjson.loads if orjson is not None else json.loads
+
+class CommandError(Exception):
+    """A malformed command; its message becomes the ERROR: reply."""
+
+@lru_cache(maxsize=256)
+def parse_color(text):
+    """Parse an "r,g,b" string into a Color, memoized since clients resend the same few colors.
+
+    Raises ValueError for non-integer fields and CommandError for values outside 0-255.
+    """
+    r, g, b = map(int, text.split(','))
+    # Any bit above the low byte (including a negative's sign bits) is out of range
+    if (r | g | b) & ~0xFF:
+        raise CommandError("COLOR_VALUES_MUST_BE_0_TO_255")
+    return Color(r, g, b)
+
+# Wire form of the fixed replies, so the common case skips formatting and encoding
+_REPLIES = {reply: f"{reply}\n".encode('utf-8') for reply in (
+    "LED", "OK:COLOR_SET", "OK:BRIGHTNESS_SET", "OK:LEDS_OFF", "OK:TEST_COMPLETE",
+    "OK:GROUP_COLOR_SET", "OK:EFFECT_STOPPED", "OK:RAINBOW_WAVE_STARTED",
+    "OK:GROUP_RAINBOW_WAVE_STARTED", "OK:INDIVIDUAL_GROUP_RAINBOW_WAVE_STARTED",
+    "OK:All effects stopped", "OK:CONFIG_UPDATED", "OK:EXITING", "ERROR:UNKNOWN_COMMAND",
+)}
+
+@lru_cache(maxsize=64)
+def parse_leds(text):
+    """Parse a comma-separated LED list into a read-only index array, memoized per string.
+
+    GUI group buttons resend the same group's list every time.
+    """
+    leds = np.array(text.split(','), dtype=np.intp)
+    leds.flags.writeable = False
+    return leds
+
+# Spellings of ALL that skip the upper() call; anything else still falls back to it
+_ALL_TOKENS = frozenset(("ALL", "all", "All"))
+
+def _is_all(strip_id):
+    """True if strip_id addresses every strip."""
+    return strip_id in _ALL_TOKENS or strip_id.upper() == "ALL"
+
+def _require(params, count, error):
+    """Raise CommandError(error) unless params has at least count entries."""
+    if not params or len(params) < count:
+        raise CommandError(error)
+
+# Commands whose trailing params are JSON that may contain ':', mapped to how many
+# leading params to split off; the rest is handed over as one string
+_SPLIT_LIMITS = {'UPDATE_CONFIG': 0, 'START_EFFECT': 2}
 
 # Map effect types to functions
 EFFECT_MAP = {
@@ -18,7 +88,7 @@ EFFECT_MAP = {
 class LEDServer:
     def __init__(self):
         # Load LED configuration
-        self.config = self.load_config()
+        self.set_config(self.load_config())
         
         # Initialize LED strips based on config
         self.strips = {}
@@ -44,45 +114,165 @@ class LEDServer:
         
         # Initialize serial connection
         self.serial = None
+        # Bytes read from the port but not yet consumed as a command line
+        self._rxbuf = bytearray()
         self.running = False
         
-        # Effect tracking: {strip_id: {'type': str, 'params': dict, 'thread': Thread, 'stop_event': Event}}
+        # NumPy views of each strip's LED buffer, made on first use
+        self._led_arrays = {}
+        # Strips filled but not yet shown because more commands were already queued
+        self._dirty = set()
+        # (brightness, color) of each strip's last solid fill, dropped once anything else draws on it
+        self._shown = {}
+        
+        # Effect tracking: {strip_id: {'type': str, 'params': dict, 'stop_event': Event, 'done': Event}}
         self.active_effects = {}
         self._lock = threading.Lock() # Lock for thread-safe access to active_effects
+        # strip_id -> job queue of that strip's long-lived effect worker, started on first use
+        self._effect_queues = {}
+
+        # Command name -> handler, so dispatch is one dict lookup
+        self._commands = {
+            'WHOAMI': self._cmd_whoami,
+            'GET_CONFIG': self._cmd_get_config,
+            'UPDATE_CONFIG': self._cmd_update_config,
+            'EXIT': self._cmd_exit,
+            'COLOR': self._cmd_color,
+            'BRIGHTNESS': self._cmd_brightness,
+            'OFF': self._cmd_off,
+            'TEST': self._cmd_test,
+            'GROUP_COLOR': self._cmd_group_color,
+            'STOP_EFFECT': self._cmd_stop_effect,
+            'RAINBOW_WAVE': self._cmd_rainbow_wave,
+            'GROUP_RAINBOW_WAVE': self._cmd_group_rainbow_wave,
+            'INDIVIDUAL_GROUP_RAINBOW_WAVE': self._cmd_individual_group_rainbow_wave,
+            'START_EFFECT': self._cmd_start_effect,
+            'STOP_ALL_EFFECTS': self._cmd_stop_all_effects,
+        }
+
+    def set_config(self, config):
+        """Make config current, serializing the GET_CONFIG reply and indexing its groups once."""
+        self.config = config
+        # Compact separators keep the reply short on the serial link
+        self._config_response = f"CONFIG:{json.dumps(config, separators=(',', ':'))}"
+        # {strip_id: {grouping_id: (grouping, {group_id: group})}}
+        self._groupings = {
+            str(strip['id']): {
+                grouping['id']: (grouping, {group['id']: group for group in grouping['groups']})
+                for grouping in strip.get('group_sets', [])
+            }
+            for strip in config['strips']
+        }
 
     def load_config(self):
         """Load LED configuration from file."""
         try:
             config_path = os.path.join(os.path.dirname(__file__), 'led_config.json')
             with open(config_path, 'r') as f:
-                return json.load(f)
+                return json_loads(f.read())
         except Exception as e:
-            print(f"Error loading config: {e}")
+            log.error("Error loading config: %s", e)
             raise  # Re-raise the exception instead of returning a default config
 
-    def update_strip(self, strip, color=None, brightness=None):
+    def update_strip(self, strip, color=None, brightness=None, defer=False):
         """Update a single strip with new color or brightness."""
-        if brightness is not None:
-            strip.setBrightness(brightness)
+        return self.update_strips((strip,), color=color, brightness=brightness, defer=defer)
+
+    def update_strips(self, strips, color=None, brightness=None, defer=False):
+        """Update several strips with new color or brightness.
+
+        Every buffer is filled before any strip is shown, so the strips
+        change together instead of one after another. Strips already
+        showing the requested solid color and brightness are left alone.
+        With defer=True the show() is left to flush_shows().
+        """
+        changed = []
+        # An effect keeps drawing over its strip, so a fill there doesn't make it known
+        effect_strips = {self.strips.get(strip_id) for strip_id in list(self.active_effects)}
+        for strip in strips:
+            shown = self._shown.get(strip)
+            if shown is not None:
+                state = (shown[0] if brightness is None else brightness,
+                         shown[1] if color is None else color)
+                if state == shown:
+                    continue
+            else:
+                state = (brightness, color)
             
-        if color is not None:
-            for i in range(strip.numPixels()):
-                strip.setPixelColor(i, color)
+            if brightness is not None:
+                strip.setBrightness(brightness)
                 
-        strip.show()
+            if color is not None:
+                # One store into the LED buffer instead of a setPixelColor() per LED
+                self._pixels(strip)[:] = color
+            
+            # Only a solid fill makes the strip's contents known
+            if state[1] is not None and strip not in effect_strips:
+                self._shown[strip] = state
+            changed.append(strip)
+                
+        self._show(changed, defer)
         return True
 
-    def set_group_color(self, strip, leds, color):
+    def _pixels(self, strip):
+        """Return the strip's cached NumPy view of its LED buffer."""
+        pixels = self._led_arrays.get(strip)
+        if pixels is None:
+            pixels = self._led_arrays[strip] = led_array(strip)
+        return pixels
+
+    def _show(self, strips, defer):
+        """Show strips now, or mark them for the next flush_shows()."""
+        if defer:
+            self._dirty.update(strips)
+        else:
+            for strip in strips:
+                strip.show()
+                self._dirty.discard(strip)
+
+    def flush_shows(self):
+        """Show every strip whose update was deferred."""
+        for strip in self._dirty:
+            strip.show()
+        self._dirty.clear()
+
+    def _input_pending(self):
+        """True if another command is already waiting on the serial port."""
+        return bool(self._rxbuf) or (self.serial is not None and self.serial.in_waiting > 0)
+
+    def _read_line(self):
+        """Return the next command line from the serial port.
+
+        Reads whatever has arrived in one call and keeps any following
+        commands in _rxbuf. On timeout returns the partial line, or b''.
+        """
+        buf = self._rxbuf
+        while True:
+            end = buf.find(b'\n')
+            if end >= 0:
+                line = bytes(buf[:end])
+                del buf[:end + 1]
+                return line
+            # Blocks up to the port timeout for the first byte, then takes the rest of the backlog
+            chunk = self.serial.read(self.serial.in_waiting or 1)
+            if not chunk:
+                line = bytes(buf)
+                buf.clear()
+                return line
+            buf += chunk
+
+    def set_group_color(self, strip, leds, color, defer=False):
         """Set color for a specific group of LEDs.
         
         Args:
             strip: The LED strip object
-            leds: List of LED indices to update
+            leds: Sequence of LED indices to update
             color: Color to set the LEDs to
+            defer: Leave the show() to flush_shows()
         """
-        for led in leds:
-            strip.setPixelColor(led, color)
-        strip.show()
+        self._shown.pop(strip, None)
+        put_color(self._pixels(strip), np.asarray(leds, dtype=np.intp), color)
+        self._show((strip,), defer)
         return True
 
     def validate_config(self, config):
@@ -133,11 +323,13 @@ class LEDServer:
             self.stop_all_effects()
 
             # Turn off all current strips
-            for strip in self.strips.values():
-                self.update_strip(strip, color=Color(0, 0, 0))
+            self.update_strips(self.strips.values(), color=OFF)
             
             # Clear current strips
             self.strips.clear()
+            self._shown.clear()
+            self._dirty.clear()
+            self._led_arrays.clear()
             
             # Initialize new strips
             for strip_config in new_config['strips']:
@@ -167,75 +359,76 @@ class LEDServer:
             if strip_id in self.active_effects:
                 effect_info = self.active_effects.pop(strip_id)
                 stop_event = effect_info.get('stop_event')
-                thread = effect_info.get('thread')
+                done = effect_info.get('done')
             else:
-                print(f"No active effect found for strip_id {strip_id} to stop.")
+                log.debug("No active effect found for strip_id %s to stop.", strip_id)
                 return # Exit if no effect found
 
         if stop_event:
             stop_event.set() # Signal the thread to stop
 
-        if thread and thread.is_alive():
-            thread.join() # Wait for the thread to finish
-            print(f"Effect thread for strip {strip_id} stopped.")
+        if done:
+            done.wait() # Wait for the worker to finish the effect
+            log.info("Effect thread for strip %s stopped.", strip_id)
 
         # Turn off the strip after the effect has stopped
         if strip_id in self.strips:
-            print(f"Turning off strip {strip_id} after stopping effect.")
+            log.debug("Turning off strip %s after stopping effect.", strip_id)
             strip = self.strips[strip_id]
-            for i in range(strip.numPixels()):
-                strip.setPixelColor(i, Color(0, 0, 0))
-            strip.show()
+            # The effect drew over whatever state was recorded
+            self._shown.pop(strip, None)
+            self.update_strip(strip, color=OFF)
         else:
-            print(f"Strip {strip_id} not found for turning off.")
+            log.warning("Strip %s not found for turning off.", strip_id)
 
     def stop_all_effects(self):
         """Stop all running effects."""
-        print("Stopping all effects...")
+        log.info("Stopping all effects...")
         with self._lock:
             strip_ids = list(self.active_effects.keys())
             effects_to_stop = list(self.active_effects.values())
             self.active_effects.clear() # Clear immediately to prevent new effects starting
 
         stop_events = [info.get('stop_event') for info in effects_to_stop if info.get('stop_event')]
-        threads = [info.get('thread') for info in effects_to_stop if info.get('thread')]
+        done_events = [info.get('done') for info in effects_to_stop if info.get('done')]
 
         # Signal all threads to stop
         for event in stop_events:
             event.set()
 
-        # Wait for all threads to finish
-        for thread in threads:
-            if thread.is_alive():
-                thread.join()
+        # Wait for all effects to finish
+        for done in done_events:
+            done.wait()
 
-        print("All effect threads stopped. Turning off strips.")
+        log.debug("All effect threads stopped. Turning off strips.")
         # Turn off all strips that had effects
         with self._lock: # Use lock although active_effects is cleared, good practice
+            strips = []
             for strip_id in strip_ids:
                 if strip_id in self.strips:
-                    strip = self.strips[strip_id]
-                    for i in range(strip.numPixels()):
-                        strip.setPixelColor(i, Color(0, 0, 0))
-                    strip.show()
+                    strips.append(self.strips[strip_id])
                 else:
-                    print(f"Strip {strip_id} not found during stop_all_effects cleanup.")
-        print("All effects stopped and strips turned off.")
+                    log.warning("Strip %s not found during stop_all_effects cleanup.", strip_id)
+            # The effects drew over whatever state was recorded
+            for strip in strips:
+                self._shown.pop(strip, None)
+            self.update_strips(strips, color=OFF)
+        log.info("All effects stopped and strips turned off.")
 
     def _run_effect_thread(self, strip_id, effect_type, params, stop_event):
-        """Wrapper function to run an effect in a dedicated thread."""
+        """Wrapper function to run an effect on its strip's worker thread."""
         if strip_id not in self.strips:
-            print(f"Error: Strip {strip_id} not found for effect {effect_type}.")
+            log.error("Strip %s not found for effect %s.", strip_id, effect_type)
             return
 
         strip = self.strips[strip_id]
         effect_func = EFFECT_MAP.get(effect_type)
 
         if not effect_func:
-            print(f"Error: Unknown effect type '{effect_type}'.")
+            log.error("Unknown effect type '%s'.", effect_type)
             return
 
-        print(f"Starting effect '{effect_type}' on strip {strip_id}.")
+        log.info("Starting effect '%s' on strip %s.", effect_type, strip_id)
         try:
             # Prepare arguments for the effect function
             effect_args = {'strip': strip}
@@ -257,13 +450,12 @@ class LEDServer:
             effect_func(**effect_args)
 
         except Exception as e:
-            print(f"Error running effect {effect_type} on strip {strip_id}: {e}")
+            log.error("Error running effect %s on strip %s: %s", effect_type, strip_id, e)
             # Ensure the strip is turned off if the effect crashes
-            for i in range(strip.numPixels()):
-                strip.setPixelColor(i, Color(0, 0, 0))
-            strip.show()
+            self._shown.pop(strip, None)
+            self.update_strip(strip, color=OFF)
         finally:
-            print(f"Effect '{effect_type}' on strip {strip_id} finished.")
+            log.info("Effect '%s' on strip %s finished.", effect_type, strip_id)
             # Ensure effect is removed from active_effects if thread ends unexpectedly
             with self._lock:
                 if strip_id in self.active_effects:
@@ -271,306 +463,312 @@ class LEDServer:
                     # (Could have been stopped and restarted quickly)
                     current_info = self.active_effects.get(strip_id)
                     if current_info and current_info.get('stop_event') == stop_event:
-                        print(f"Cleaning up active_effects entry for strip {strip_id} after thread exit.")
+                        log.debug("Cleaning up active_effects entry for strip %s after thread exit.", strip_id)
                         del self.active_effects[strip_id]
 
+    def _effect_worker(self, strip_id, jobs):
+        """Run a strip's effects one job at a time until a None job arrives."""
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            effect_type, params, stop_event, done = job
+            try:
+                self._run_effect_thread(strip_id, effect_type, params, stop_event)
+            finally:
+                done.set()
+
     def start_effect(self, strip_id, effect_type, params):
-        """Start a new effect in its own thread."""
+        """Start a new effect on the strip's worker thread."""
         if strip_id not in self.strips:
             return f"ERROR:Invalid strip ID {strip_id}"
         if effect_type not in EFFECT_MAP:
             return f"ERROR:Unknown effect type {effect_type}"
 
+        # Re-issuing the running effect with the same params leaves it running
+        current = self.active_effects.get(strip_id)
+        if current and current['type'] == effect_type and current['params'] == params:
+            return f"OK:Effect {effect_type} already running on strip {strip_id}"
+
         # Stop any existing effect on the same strip first
         self.stop_effect(strip_id)
+        # The effect draws straight into the LED buffer
+        self._shown.pop(self.strips[strip_id], None)
+
+        jobs = self._effect_queues.get(strip_id)
+        if jobs is None:
+            # Restarting an effect then only costs a queue put, not a new thread
+            jobs = self._effect_queues[strip_id] = queue.Queue()
+            threading.Thread(
+                target=self._effect_worker,
+                args=(strip_id, jobs),
+                daemon=True # Allows program to exit even if threads are running
+            ).start()
 
         stop_event = threading.Event()
-        thread = threading.Thread(
-            target=self._run_effect_thread,
-            args=(strip_id, effect_type, params, stop_event),
-            daemon=True # Allows program to exit even if threads are running
-        )
-
+        done = threading.Event()
         with self._lock:
             self.active_effects[strip_id] = {
                 'type': effect_type,
                 'params': params,
-                'thread': thread,
-                'stop_event': stop_event
+                'stop_event': stop_event,
+                'done': done
             }
 
-        thread.start()
+        jobs.put((effect_type, params, stop_event, done))
         return f"OK:Effect {effect_type} started on strip {strip_id}"
 
-    def handle_led_command(self, command, params=None):
-        """Handle LED control commands."""
+    def _require_strip(self, strip_id):
+        """Return the strip for strip_id, raising CommandError if there is none."""
+        strip = self.strips.get(strip_id)
+        if strip is None:
+            raise CommandError("INVALID_STRIP_ID")
+        return strip
+
+    def _cmd_whoami(self, params):
+        """Identify this end of the link as the LED server."""
+        return "LED"
+
+    def _cmd_get_config(self, params):
+        """Return the current LED configuration as JSON."""
+        return self._config_response
+
+    def _cmd_update_config(self, params):
+        """Validate, save and apply a new LED configuration."""
+        _require(params, 1, "UPDATE_CONFIG_REQUIRES_JSON_DATA")
+            
         try:
-            if command == "WHOAMI":
-                return "LED"
+            # Join all parameters back together as they might contain colons
+            # (start() passes the payload whole, so this is normally a no-op)
+            config_json = ':'.join(params)
+            new_config = json_loads(config_json)
             
-            elif command == "GET_CONFIG":
-                return f"CONFIG:{json.dumps(self.config)}"
+            # Validate config format and values
+            valid, message = self.validate_config(new_config)
+            if not valid:
+                return f"ERROR:{message}"
             
-            elif command == "UPDATE_CONFIG":
-                if not params:
-                    return "ERROR:UPDATE_CONFIG_REQUIRES_JSON_DATA"
-                    
-                try:
-                    # Join all parameters back together as they might contain colons
-                    config_json = ':'.join(params)
-                    new_config = json.loads(config_json)
-                    
-                    # Validate config format and values
-                    valid, message = self.validate_config(new_config)
-                    if not valid:
-                        return f"ERROR:{message}"
-                    
-                    # Save config to file
-                    saved, message = self.save_config_to_file(new_config)
-                    if not saved:
-                        return f"ERROR:{message}"
-                    
-                    # Update current config
-                    self.config = new_config
-                    
-                    # Reinitialize strips with new config
-                    success, message = self.reinitialize_strips(new_config)
-                    if not success:
-                        return f"ERROR:{message}"
-                    
-                    return "OK:CONFIG_UPDATED"
-                    
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")  # Debug print
-                    return "ERROR:INVALID_JSON_FORMAT"
-                except Exception as e:
-                    print(f"Error processing UPDATE_CONFIG: {e}") # Debug print
-                    return f"ERROR:Unexpected error processing config update: {e}"
+            # Save config to file
+            saved, message = self.save_config_to_file(new_config)
+            if not saved:
+                return f"ERROR:{message}"
             
-            elif command == "EXIT":
-                print("Exit command received, shutting down...")
-                self.running = False
-                return "OK:EXITING"
+            # Update current config
+            self.set_config(new_config)
             
-            elif command == "COLOR":
-                # Parse COLOR:strip_id:r,g,b format
-                if not params or len(params) < 2:
-                    return "ERROR:COLOR_REQUIRES_STRIP_AND_RGB"
-                try:
-                    strip_id = params[0]
-                    r, g, b = map(int, params[1].split(','))
-                    
-                    if not all(0 <= x <= 255 for x in (r, g, b)):
-                        return "ERROR:COLOR_VALUES_MUST_BE_0_TO_255"
-                    
-                    color = Color(r, g, b)
-                    if strip_id.upper() == "ALL":
-                        # Update all strips
-                        for strip in self.strips.values():
-                            self.update_strip(strip, color=color)
-                    elif strip_id in self.strips:
-                        self.update_strip(self.strips[strip_id], color=color)
-                    else:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    return "OK:COLOR_SET"
-                except ValueError:
-                    return "ERROR:COLOR_VALUES_MUST_BE_INTEGERS"
-                
-            elif command == "BRIGHTNESS":
-                # Parse BRIGHTNESS:strip_id:value format
-                if not params or len(params) < 2:
-                    return "ERROR:BRIGHTNESS_REQUIRES_STRIP_AND_VALUE"
-                try:
-                    strip_id = params[0]
-                    brightness = int(params[1])
-                    if not 0 <= brightness <= 255:
-                        return "ERROR:BRIGHTNESS_MUST_BE_0_TO_255"
-                    
-                    if strip_id.upper() == "ALL":
-                        # Update all strips
-                        for strip in self.strips.values():
-                            self.update_strip(strip, brightness=brightness)
-                    elif strip_id in self.strips:
-                        self.update_strip(self.strips[strip_id], brightness=brightness)
-                    else:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    return "OK:BRIGHTNESS_SET"
-                except ValueError:
-                    return "ERROR:BRIGHTNESS_MUST_BE_INTEGER"
+            # Reinitialize strips with new config
+            success, message = self.reinitialize_strips(new_config)
+            if not success:
+                return f"ERROR:{message}"
+            
+            return "OK:CONFIG_UPDATED"
+            
+        except json.JSONDecodeError as e:
+            log.error("JSON decode error: %s", e)
+            return "ERROR:INVALID_JSON_FORMAT"
+        except Exception as e:
+            log.error("Error processing UPDATE_CONFIG: %s", e)
+            return f"ERROR:Unexpected error processing config update: {e}"
+
+    def _cmd_exit(self, params):
+        """Stop the server loop."""
+        log.info("Exit command received, shutting down...")
+        self.running = False
+        return "OK:EXITING"
+
+    def _cmd_color(self, params):
+        """Set a solid color on one strip or ALL."""
+        # Parse COLOR:strip_id:r,g,b format
+        _require(params, 2, "COLOR_REQUIRES_STRIP_AND_RGB")
+        try:
+            strip_id = params[0]
+            color = parse_color(params[1])
+            # Leave show() for the last of a burst of queued commands
+            defer = self._input_pending()
+            if _is_all(strip_id):
+                # Update all strips
+                self.update_strips(self.strips.values(), color=color, defer=defer)
+            elif strip_id in self.strips:
+                self.update_strip(self.strips[strip_id], color=color, defer=defer)
+            else:
+                return "ERROR:INVALID_STRIP_ID"
+            
+            return "OK:COLOR_SET"
+        except ValueError:
+            return "ERROR:COLOR_VALUES_MUST_BE_INTEGERS"
+
+    def _cmd_brightness(self, params):
+        """Set the brightness of one strip or ALL."""
+        # Parse BRIGHTNESS:strip_id:value format
+        _require(params, 2, "BRIGHTNESS_REQUIRES_STRIP_AND_VALUE")
+        try:
+            strip_id = params[0]
+            brightness = int(params[1])
+            if not 0 <= brightness <= 255:
+                return "ERROR:BRIGHTNESS_MUST_BE_0_TO_255"
+            
+            defer = self._input_pending()
+            if _is_all(strip_id):
+                # Update all strips
+                self.update_strips(self.strips.values(), brightness=brightness, defer=defer)
+            elif strip_id in self.strips:
+                self.update_strip(self.strips[strip_id], brightness=brightness, defer=defer)
+            else:
+                return "ERROR:INVALID_STRIP_ID"
+            
+            return "OK:BRIGHTNESS_SET"
+        except ValueError:
+            return "ERROR:BRIGHTNESS_MUST_BE_INTEGER"
+
+    def _cmd_off(self, params):
+        """Turn off all strips."""
+        self.update_strips(self.strips.values(), color=OFF, defer=self._input_pending())
+        return "OK:LEDS_OFF"
+
+    def _cmd_test(self, params):
+        """Flash all strips white."""
+        # Simple test pattern - white flash
+        self.update_strips(self.strips.values(), color=WHITE)
+        time.sleep(0.5)
+        self.update_strips(self.strips.values(), color=OFF)
+        return "OK:TEST_COMPLETE"
+
+    def _cmd_group_color(self, params):
+        """Set a solid color on a list of LEDs."""
+        # Format: GROUP_COLOR:strip_id:led1,led2,led3...:r,g,b
+        _require(params, 3, "GROUP_COLOR_REQUIRES_STRIP_LEDS_AND_RGB")
+        try:
+            strip_id = params[0]
+            leds = parse_leds(params[1])
+            color = parse_color(params[2])
+            strip = self._require_strip(strip_id)
+            self.set_group_color(strip, leds, color, defer=self._input_pending())
+            return "OK:GROUP_COLOR_SET"
                 
-            elif command == "OFF":
-                # Turn off all strips
-                for strip in self.strips.values():
-                    self.update_strip(strip, color=Color(0, 0, 0))
-                return "OK:LEDS_OFF"
+        except ValueError:
+            return "ERROR:INVALID_PARAMETERS"
+
+    def _cmd_stop_effect(self, params):
+        """Stop the effect running on a strip."""
+        # Format: STOP_EFFECT:strip_id
+        _require(params, 1, "STOP_EFFECT_REQUIRES_STRIP_ID")
+        strip_id = params[0]
+        self._require_strip(strip_id)
+        self.stop_effect(strip_id)
+        return "OK:EFFECT_STOPPED"
+
+    def _cmd_rainbow_wave(self, params):
+        """Start a rainbow wave across a whole strip."""
+        # Format: RAINBOW_WAVE:strip_id:wait_ms
+        _require(params, 2, "RAINBOW_WAVE_REQUIRES_STRIP_AND_WAIT_MS")
+        try:
+            strip_id = params[0]
+            wait_ms = int(params[1])
+            self._require_strip(strip_id)
+            
+            # Start new effect (start_effect stops any running one)
+            self.start_effect(strip_id, 'RAINBOW_WAVE', {'wait_ms': wait_ms})
+            return "OK:RAINBOW_WAVE_STARTED"
+        except ValueError:
+            return "ERROR:INVALID_PARAMETERS"
+
+    def _cmd_group_rainbow_wave(self, params):
+        """Start a rainbow wave across the groups of a grouping."""
+        # Format: GROUP_RAINBOW_WAVE:strip_id:grouping_id:wait_ms
+        _require(params, 3, "GROUP_RAINBOW_WAVE_REQUIRES_STRIP_GROUPING_AND_WAIT_MS")
+        try:
+            strip_id = params[0]
+            grouping_id = int(params[1])
+            wait_ms = int(params[2])
+            self._require_strip(strip_id)
+            
+            # Find the grouping in the config
+            groupings = self._groupings.get(strip_id)
+            if groupings is None:
+                return "ERROR:STRIP_NOT_FOUND"
                 
-            elif command == "TEST":
-                # Simple test pattern - white flash
-                for strip in self.strips.values():
-                    self.update_strip(strip, color=Color(0, 0, 0))
-                for strip in self.strips.values():
-                    self.update_strip(strip, color=Color(255, 255, 255))
-                time.sleep(0.5)
-                for strip in self.strips.values():
-                    self.update_strip(strip, color=Color(0, 0, 0))
-                return "OK:TEST_COMPLETE"
+            entry = groupings.get(grouping_id)
+            if not entry:
+                return "ERROR:GROUPING_NOT_FOUND"
+            
+            # Extract LED groups
+            groups = [group['leds'] for group in entry[0]['groups']]
+            
+            # Start new effect (start_effect stops any running one)
+            self.start_effect(strip_id, 'GROUP_RAINBOW_WAVE', {
+                'groups': groups,
+                'wait_ms': wait_ms
+            })
+            return "OK:GROUP_RAINBOW_WAVE_STARTED"
+        except ValueError:
+            return "ERROR:INVALID_PARAMETERS"
+
+    def _cmd_individual_group_rainbow_wave(self, params):
+        """Start a rainbow wave across the LEDs of one group."""
+        # Format: INDIVIDUAL_GROUP_RAINBOW_WAVE:strip_id:grouping_id:group_id:wait_ms
+        _require(params, 4, "INDIVIDUAL_GROUP_RAINBOW_WAVE_REQUIRES_STRIP_GROUPING_GROUP_AND_WAIT_MS")
+        try:
+            strip_id = params[0]
+            grouping_id = int(params[1])
+            group_id = int(params[2])
+            wait_ms = int(params[3])
+            self._require_strip(strip_id)
+            
+            # Find the grouping and group in the config
+            groupings = self._groupings.get(strip_id)
+            if groupings is None:
+                return "ERROR:STRIP_NOT_FOUND"
                 
-            elif command == "GROUP_COLOR":
-                # Format: GROUP_COLOR:strip_id:led1,led2,led3...:r,g,b
-                if not params or len(params) < 3:
-                    return "ERROR:GROUP_COLOR_REQUIRES_STRIP_LEDS_AND_RGB"
-                try:
-                    strip_id = params[0]
-                    leds = [int(x) for x in params[1].split(',')]
-                    r, g, b = map(int, params[2].split(','))
-                    
-                    if not all(0 <= x <= 255 for x in (r, g, b)):
-                        return "ERROR:COLOR_VALUES_MUST_BE_0_TO_255"
-                    
-                    if strip_id not in self.strips:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    color = Color(r, g, b)
-                    self.set_group_color(self.strips[strip_id], leds, color)
-                    return "OK:GROUP_COLOR_SET"
-                        
-                except ValueError:
-                    return "ERROR:INVALID_PARAMETERS"
+            entry = groupings.get(grouping_id)
+            if not entry:
+                return "ERROR:GROUPING_NOT_FOUND"
                 
-            elif command == "STOP_EFFECT":
-                # Format: STOP_EFFECT:strip_id
-                if not params:
-                    return "ERROR:STOP_EFFECT_REQUIRES_STRIP_ID"
-                strip_id = params[0]
-                if strip_id not in self.strips:
-                    return "ERROR:INVALID_STRIP_ID"
-                self.stop_effect(strip_id)
-                return "OK:EFFECT_STOPPED"
-
-            elif command == "RAINBOW_WAVE":
-                # Format: RAINBOW_WAVE:strip_id:wait_ms
-                if not params or len(params) < 2:
-                    return "ERROR:RAINBOW_WAVE_REQUIRES_STRIP_AND_WAIT_MS"
-                try:
-                    strip_id = params[0]
-                    wait_ms = int(params[1])
-                    
-                    if strip_id not in self.strips:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    # Stop any running effect on this strip
-                    if strip_id in self.active_effects:
-                        self.stop_effect(strip_id)
-                    
-                    # Start new effect
-                    self.start_effect(strip_id, 'RAINBOW_WAVE', {'wait_ms': wait_ms})
-                    return "OK:RAINBOW_WAVE_STARTED"
-                except ValueError:
-                    return "ERROR:INVALID_PARAMETERS"
-
-            elif command == "GROUP_RAINBOW_WAVE":
-                # Format: GROUP_RAINBOW_WAVE:strip_id:grouping_id:wait_ms
-                if not params or len(params) < 3:
-                    return "ERROR:GROUP_RAINBOW_WAVE_REQUIRES_STRIP_GROUPING_AND_WAIT_MS"
-                try:
-                    strip_id = params[0]
-                    grouping_id = int(params[1])
-                    wait_ms = int(params[2])
-                    
-                    if strip_id not in self.strips:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    # Find the grouping in the config
-                    strip_config = next((s for s in self.config['strips'] if str(s['id']) == strip_id), None)
-                    if not strip_config:
-                        return "ERROR:STRIP_NOT_FOUND"
-                        
-                    grouping = next((g for g in strip_config['group_sets'] if g['id'] == grouping_id), None)
-                    if not grouping:
-                        return "ERROR:GROUPING_NOT_FOUND"
-                    
-                    # Extract LED groups
-                    groups = [group['leds'] for group in grouping['groups']]
-                    
-                    # Stop any running effect on this strip
-                    if strip_id in self.active_effects:
-                        self.stop_effect(strip_id)
-                    
-                    # Start new effect
-                    self.start_effect(strip_id, 'GROUP_RAINBOW_WAVE', {
-                        'groups': groups,
-                        'wait_ms': wait_ms
-                    })
-                    return "OK:GROUP_RAINBOW_WAVE_STARTED"
-                except ValueError:
-                    return "ERROR:INVALID_PARAMETERS"
-
-            elif command == "INDIVIDUAL_GROUP_RAINBOW_WAVE":
-                # Format: INDIVIDUAL_GROUP_RAINBOW_WAVE:strip_id:grouping_id:group_id:wait_ms
-                if not params or len(params) < 4:
-                    return "ERROR:INDIVIDUAL_GROUP_RAINBOW_WAVE_REQUIRES_STRIP_GROUPING_GROUP_AND_WAIT_MS"
-                try:
-                    strip_id = params[0]
-                    grouping_id = int(params[1])
-                    group_id = int(params[2])
-                    wait_ms = int(params[3])
-                    
-                    if strip_id not in self.strips:
-                        return "ERROR:INVALID_STRIP_ID"
-                    
-                    # Find the grouping and group in the config
-                    strip_config = next((s for s in self.config['strips'] if str(s['id']) == strip_id), None)
-                    if not strip_config:
-                        return "ERROR:STRIP_NOT_FOUND"
-                        
-                    grouping = next((g for g in strip_config['group_sets'] if g['id'] == grouping_id), None)
-                    if not grouping:
-                        return "ERROR:GROUPING_NOT_FOUND"
-                        
-                    group = next((g for g in grouping['groups'] if g['id'] == group_id), None)
-                    if not group:
-                        return "ERROR:GROUP_NOT_FOUND"
-                    
-                    # Stop any running effect on this strip
-                    if strip_id in self.active_effects:
-                        self.stop_effect(strip_id)
-                    
-                    # Start new effect
-                    self.start_effect(strip_id, 'INDIVIDUAL_GROUP_RAINBOW_WAVE', {
-                        'leds': group['leds'],
-                        'wait_ms': wait_ms
-                    })
-                    return "OK:INDIVIDUAL_GROUP_RAINBOW_WAVE_STARTED"
-                except ValueError:
-                    return "ERROR:INVALID_PARAMETERS"
-                    
-            elif command == "START_EFFECT":
-                if not params or len(params) < 2:
-                    return "ERROR:START_EFFECT_REQUIRES_STRIP_ID_AND_EFFECT_TYPE"
-
-                strip_id = params[0]
-                effect_type = params[1]
-                effect_params = {}
-                if len(params) > 2:
-                    try:
-                        # Join remaining params and parse as JSON
-                        params_json = ':'.join(params[2:])
-                        effect_params = json.loads(params_json)
-                    except json.JSONDecodeError:
-                        return "ERROR:INVALID_JSON_FOR_EFFECT_PARAMS"
-                    except Exception as e:
-                        return f"ERROR:Could not parse effect params: {e}"
-
-                return self.start_effect(strip_id, effect_type, effect_params)
-
-            elif command == "STOP_ALL_EFFECTS":
-                self.stop_all_effects()
-                return "OK:All effects stopped"
+            group = entry[1].get(group_id)
+            if not group:
+                return "ERROR:GROUP_NOT_FOUND"
+            
+            # Start new effect (start_effect stops any running one)
+            self.start_effect(strip_id, 'INDIVIDUAL_GROUP_RAINBOW_WAVE', {
+                'leds': group['leds'],
+                'wait_ms': wait_ms
+            })
+            return "OK:INDIVIDUAL_GROUP_RAINBOW_WAVE_STARTED"
+        except ValueError:
+            return "ERROR:INVALID_PARAMETERS"
+
+    def _cmd_start_effect(self, params):
+        """Start any EFFECT_MAP effect with JSON params."""
+        _require(params, 2, "START_EFFECT_REQUIRES_STRIP_ID_AND_EFFECT_TYPE")
+
+        strip_id = params[0]
+        effect_type = params[1]
+        effect_params = {}
+        if len(params) > 2:
+            try:
+                # Join remaining params and parse as JSON
+                params_json = ':'.join(params[2:])
+                effect_params = json_loads(params_json)
+            except json.JSONDecodeError:
+                return "ERROR:INVALID_JSON_FOR_EFFECT_PARAMS"
+            except Exception as e:
+                return f"ERROR:Could not parse effect params: {e}"
+
+        return self.start_effect(strip_id, effect_type, effect_params)
+
+    def _cmd_stop_all_effects(self, params):
+        """Stop every running effect."""
+        self.stop_all_effects()
+        return "OK:All effects stopped"
 
+    def handle_led_command(self, command, params=None):
+        """Handle LED control commands."""
+        handler = self._commands.get(command)
+        if handler is None:
+            handler = self._commands.get(command.upper())
+        if handler is None:
             return "ERROR:UNKNOWN_COMMAND"
-            
+        try:
+            return handler(params)
         except Exception as e:
             return f"ERROR:{str(e)}"
         
@@ -578,96 +776,106 @@ class LEDServer:
         """Initialize and start the LED server."""
         try:
             # Initialize LED strips
-            print("Initializing LED strips...")
+            log.info("Initializing LED strips...")
             for strip in self.strips.values():
                 strip.begin()
+            # begin() allocates fresh LED buffers, so earlier views are stale
+            self._led_arrays.clear()
             # Turn off all strips
-            for strip in self.strips.values():
-                self.update_strip(strip, color=Color(0, 0, 0))
+            self.update_strips(self.strips.values(), color=OFF)
             
             # Initialize serial connection
-            print("Opening serial port...")
+            log.info("Opening serial port...")
             try:
                 # Try to take over the serial port from system console
-                import subprocess
+                # systemctl stop waits for the getty to exit, so the port is free when it returns
                 subprocess.run(['systemctl', 'stop', 'serial-getty@ttyGS0.service'], check=False)
-                time.sleep(1)  # Give system time to release port
                 
                 self.serial = serial.Serial('/dev/ttyGS0', 115200, timeout=1)
                 self.running = True
                 
-                print(f"LED Server started successfully on {self.serial.port}!")
-                print("Send 'EXIT' to terminate")
+                log.info("LED Server started successfully on %s!", self.serial.port)
+                log.info("Send 'EXIT' to terminate")
                 
             except Exception as e:
-                print(f"Failed to take control of serial port: {e}")
-                print("Make sure you have permission to access the serial port")
-                print("You might need to run this script as root")
+                log.error("Failed to take control of serial port: %s", e)
+                log.error("Make sure you have permission to access the serial port")
+                log.error("You might need to run this script as root")
                 return
             
+            # Per-command tracing is off unless --debug; decide once rather than per line
+            debug = log.isEnabledFor(logging.DEBUG)
+            
             # Main loop
             while self.running:
-                if self.serial.in_waiting:
-                    # Read until we get a newline
-                    command_line = ''
-                    while True:
-                        char = self.serial.read().decode('utf-8', errors='ignore')
-                        if char == '\n' or char == '':
-                            break
-                        command_line += char
+                # Block until a line arrives; the 1s port timeout brings us back to check running
+                raw = self._read_line()
+                command_line = raw.decode('utf-8', errors='ignore').strip()
+                if command_line:
+                    if debug:
+                        log.debug("Raw command received: %r", command_line)
                     
-                    command_line = command_line.strip()
-                    if command_line:
-                        print(f"Raw command received: {command_line!r}")
-                        
-                        if command_line.upper() == 'EXIT':
-                            print("Exit command received!")
-                            for strip in self.strips.values():
-                                self.update_strip(strip, color=Color(0, 0, 0))
-                            break
-                            
-                        # Parse command and parameters
-                        parts = command_line.split(':')
-                        command = parts[0].upper()
-                        params = parts[1:] if len(parts) > 1 else []
-                        
-                        print(f"Received command: {command} with params: {params}")
-                        response = self.handle_led_command(command, params)
-                        response_bytes = f"{response}\n".encode('utf-8')
-                        print(f"Sending response: {response_bytes!r}")
-                        self.serial.write(response_bytes)
-                        self.serial.flush()
+                    # Length check first so a large UPDATE_CONFIG line is never upper()-copied
+                    if len(command_line) == 4 and command_line.upper() == 'EXIT':
+                        log.info("Exit command received!")
+                        self.update_strips(self.strips.values(), color=OFF)
+                        break
                         
+                    # Parse command and parameters
+                    command, sep, rest = command_line.partition(':')
+                    params = rest.split(':', _SPLIT_LIMITS.get(command, -1)) if sep else []
+                    
+                    if debug:
+                        log.debug("Received command: %s with params: %s", command, params)
+                    response = self.handle_led_command(command, params)
+                    response_bytes = _REPLIES.get(response) or f"{response}\n".encode('utf-8')
+                    if debug:
+                        log.debug("Sending response: %r", response_bytes)
+                    # write() hands the reply to the tty driver; no need to wait for it to drain
+                    self.serial.write(response_bytes)
+                
+                # Show anything held back once the burst of queued commands is done,
+                # even if what was still queued turned out to be a blank line or a timeout
+                if self._dirty and not self._input_pending():
+                    self.flush_shows()
+                    
         except Exception as e:
-            print(f"Error: {str(e)}")
+            log.error("Error: %s", e)
         finally:
             self.cleanup()
     
     def cleanup(self):
         """Clean shutdown of server."""
-        print("\nShutting down LED Server...")
+        log.info("Shutting down LED Server...")
         self.running = False
-        # Stop all effects
+        # Stop all effects and let the effect workers exit
         self.stop_all_effects()
+        for jobs in self._effect_queues.values():
+            jobs.put(None)
         # Turn off all strips
-        for strip in self.strips.values():
-            self.update_strip(strip, color=Color(0, 0, 0))
+        self.update_strips(self.strips.values(), color=OFF)
         if self.serial and self.serial.is_open:
+            self.serial.flush()
             self.serial.close()
             # Restart system console service
             try:
-                import subprocess
-                subprocess.run(['systemctl', 'start', 'serial-getty@ttyGS0.service'], check=False)
+                # Nothing here depends on the getty being up, so don't wait for the job
+                subprocess.run(['systemctl', '--no-block', 'start', 'serial-getty@ttyGS0.service'], check=False)
             except:
                 pass
-        print("Shutdown complete. Serial console restored.")
+        log.info("Shutdown complete. Serial console restored.")
 
 def main():
+    parser = argparse.ArgumentParser(description="LED Controller server")
+    parser.add_argument('--debug', action='store_true', help="log every command and response")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO, format='%(message)s')
+    
     server = LEDServer()
     try:
         server.start()
     except KeyboardInterrupt:
-        print("\nKeyboard interrupt received...")
+        log.info("Keyboard interrupt received...")
     finally:
         server.cleanup()
 